@@ -1,5 +1,8 @@
 from ._version import __version__  # noqa: F401
+from .epochs_stream import EpochsStream  # noqa: F401
 from .player import Player  # noqa: F401
 from .stream import Stream  # noqa: F401
+from .stream_group import StreamGroup  # noqa: F401
+from .stream_reader import StreamReader  # noqa: F401
 from .utils.config import sys_info  # noqa: F401
 from .utils.logs import add_file_handler, logger, set_log_level  # noqa: F401
@@ -0,0 +1,364 @@
+from __future__ import annotations  # c.f. PEP 563, PEP 649
+
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .stream import Stream
+from .utils._checks import check_type, ensure_int
+from .utils._docs import fill_doc
+from .utils.logs import logger
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Tuple, Union
+
+    from numpy.typing import NDArray
+
+
+@fill_doc
+class EpochsStream:
+    """Online epoching of a Stream around the events of a marker stream.
+
+    Parameters
+    ----------
+    stream : Stream
+        Connected stream, with a regular sampling rate, from which the epochs are
+        extracted.
+    marker_stream : Stream
+        Connected stream with the events, e.g. the stream created by a
+        :class:`~bsl.triggers.LSLTrigger`. The event values are read on its first
+        channel.
+    event_id : int | list of int | dict | None
+        Values of the events to epoch. A dictionary maps event names to values, as in
+        MNE. If ``None``, every event is epoched.
+    tmin : float
+        Start time of the epochs in seconds, relative to the event.
+    tmax : float
+        End time of the epochs in seconds, relative to the event.
+    %(baseline_epochs)s
+    %(picks_all)s
+    maxsize : int
+        Maximum number of epochs queued. Once the queue is full, the oldest epoch is
+        dropped to make room for the new ones.
+
+    Notes
+    -----
+    The timestamps of both streams must be expressed in the same clock, which is the
+    case for streams emitted on the same computer. Else, connect both streams with
+    the ``'clocksync'`` processing flag.
+
+    An epoch is extracted as soon as the samples up to ``tmax`` after its event are
+    acquired. The epochs ready at the same time are extracted together from a single
+    read of the buffer spanning their windows.
+    """
+
+    def __init__(
+        self,
+        stream: Stream,
+        marker_stream: Stream,
+        event_id: Optional[Union[int, List[int], Dict[str, int]]] = None,
+        tmin: float = -0.2,
+        tmax: float = 0.5,
+        baseline: Optional[Tuple[Optional[float], Optional[float]]] = (None, 0),
+        picks=None,
+        maxsize: int = 100,
+    ):
+        check_type(stream, (Stream,), "stream")
+        check_type(marker_stream, (Stream,), "marker_stream")
+        stream._check_connected(name="EpochsStream()")
+        stream._check_regular_sampling(name="EpochsStream()")
+        marker_stream._check_connected(name="EpochsStream()")
+        self._stream = stream
+        self._marker_stream = marker_stream
+        # events
+        check_type(event_id, ("int-like", list, tuple, dict, None), "event_id")
+        if event_id is None:
+            self._event_id = None
+        else:
+            if isinstance(event_id, dict):
+                values = list(event_id.values())
+            elif isinstance(event_id, (list, tuple)):
+                values = list(event_id)
+            else:
+                values = [event_id]
+            self._event_id = np.array(
+                [ensure_int(value, "event_id") for value in values], dtype=np.int64
+            )
+        # window
+        check_type(tmin, ("numeric",), "tmin")
+        check_type(tmax, ("numeric",), "tmax")
+        if tmax <= tmin:
+            raise ValueError(
+                "The argument 'tmax' must be strictly greater than 'tmin'. "
+                f"{tmax} <= {tmin} is invalid."
+            )
+        sfreq = stream.info["sfreq"]
+        self._first = int(round(tmin * sfreq))
+        self._times = np.arange(self._first, int(round(tmax * sfreq)) + 1) / sfreq
+        if stream._timestamps.size < self._times.size:
+            raise ValueError(
+                f"The epochs of {self._times.size} samples do not fit in the buffer of "
+                f"the stream of {stream._timestamps.size} samples."
+            )
+        # baseline
+        check_type(baseline, (tuple, list, None), "baseline")
+        if baseline is None:
+            self._baseline = None
+        else:
+            if len(baseline) != 2:
+                raise ValueError(
+                    "The argument 'baseline' must be a tuple (a, b) of length 2. "
+                    f"{baseline} is invalid."
+                )
+            bmin = self._times[0] if baseline[0] is None else baseline[0]
+            bmax = self._times[-1] if baseline[1] is None else baseline[1]
+            check_type(bmin, ("numeric",), "baseline")
+            check_type(bmax, ("numeric",), "baseline")
+            self._baseline = (self._times >= bmin) & (self._times <= bmax)
+            if bmax < bmin or not self._baseline.any():
+                raise ValueError(
+                    "The argument 'baseline' must define an interval within the "
+                    f"epochs [{self._times[0]}, {self._times[-1]}]. {baseline} is "
+                    "invalid."
+                )
+        self._picks = stream._get_picks(picks)
+        self._ch_names = [stream.ch_names[k] for k in self._picks]
+        maxsize = ensure_int(maxsize, "maxsize")
+        if maxsize <= 0:
+            raise ValueError(
+                "The argument 'maxsize' must be a strictly positive integer. "
+                f"{maxsize} is invalid."
+            )
+        self._queue = Queue(maxsize=maxsize)
+        self._events = np.empty(0, dtype=np.int64)
+        self._events_ts = np.empty(0, dtype=np.float64)
+        self._stop = None
+        self._thread = None
+
+    def __del__(self):
+        """Stop the extraction of epochs."""
+        try:
+            self.disconnect()
+        except Exception:
+            pass
+
+    def __repr__(self):
+        """Representation of the instance."""
+        status = "ON" if self.connected else "OFF"
+        return (
+            f"<EpochsStream: {status} | {self._stream.name} | "
+            f"{self._times[0]:.3f} - {self._times[-1]:.3f} s>"
+        )
+
+    def connect(self) -> None:
+        """Start the extraction of the epochs of the new events."""
+        if self.connected:
+            logger.warning("The epochs stream is already connected. Skipping.")
+            return None
+        # the events received before the connection are not epoched
+        marker_stream = self._marker_stream
+        self._last_marker_ts = (
+            marker_stream._timestamps[marker_stream._write_idx - 1]
+            if marker_stream._n_samples_acquired != 0
+            else -np.inf
+        )
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def disconnect(self) -> None:
+        """Stop the extraction of the epochs."""
+        if self._thread is None:
+            return None
+        self._stop.set()
+        condition = self._stream._acquisition_condition
+        if condition is not None:
+            with condition:
+                condition.notify_all()
+        self._thread.join()
+        self._thread = None
+        self._stop = None
+
+    def get_epoch(
+        self, timeout: Optional[float] = None
+    ) -> Optional[Tuple[NDArray[float], int, float]]:
+        """Retrieve the oldest epoch from the queue.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum time (in seconds) to wait for an epoch. ``None`` blocks until an
+            epoch is available, ``0`` does not block.
+
+        Returns
+        -------
+        data : array of shape (n_channels, n_times) | None
+            Data of the epoch.
+        event : int | None
+            Value of the event.
+        timestamp : float | None
+            Timestamp of the event.
+
+        Notes
+        -----
+        If the ``timeout`` expired, ``(None, None, None)`` is returned.
+        """
+        if timeout is not None:
+            check_type(timeout, ("numeric",), "timeout")
+        try:
+            return self._queue.get(block=timeout != 0, timeout=timeout or None)
+        except Empty:
+            return None, None, None
+
+    def _run(self) -> None:
+        """Extract the epochs when woken up by the acquisition of new samples."""
+        stream = self._stream
+        stop = self._stop
+        # local references since the variables are reset on disconnection
+        condition = stream._acquisition_condition
+        stream_stop = stream._acquisition_stop
+        n_samples_acquired = stream._n_samples_acquired
+        while not stop.is_set():
+            with condition:
+                condition.wait_for(
+                    lambda: stop.is_set()
+                    or stream_stop.is_set()
+                    or stream._n_samples_acquired != n_samples_acquired,
+                )
+                if stop.is_set() or stream_stop.is_set():
+                    break
+                n_samples_acquired = stream._n_samples_acquired
+            try:
+                self._update_events()
+                self._extract_epochs()
+            except Exception as error:
+                if not (stream.connected and self._marker_stream.connected):
+                    logger.info("A stream was disconnected, stopping the epoching.")
+                    break
+                logger.exception(error)
+                break
+
+    def _update_events(self) -> None:
+        """Append the new events of the marker stream to the pending events."""
+        # the slots of the marker buffer never written are excluded from the window
+        data, timestamps = self._marker_stream.get_data_between(
+            self._last_marker_ts, np.inf
+        )
+        mask = self._last_marker_ts < timestamps
+        if not mask.any():
+            return None
+        events = data[0, mask].astype(np.int64)
+        timestamps = timestamps[mask]
+        self._last_marker_ts = timestamps[-1]
+        if self._event_id is not None:
+            mask = np.isin(events, self._event_id)
+            events = events[mask]
+            timestamps = timestamps[mask]
+        self._events = np.concatenate((self._events, events))
+        self._events_ts = np.concatenate((self._events_ts, timestamps))
+
+    def _extract_epochs(self) -> None:
+        """Extract the epochs of the pending events with a complete window."""
+        if self._events.size == 0:
+            return None
+        stream = self._stream
+        sfreq = stream.info["sfreq"]
+        latest = stream._timestamps[stream._write_idx - 1]
+        n_ready = np.searchsorted(
+            self._events_ts + self._times[-1] + 1 / sfreq, latest, side="right"
+        )
+        if n_ready == 0:
+            return None
+        events = self._events[:n_ready]
+        events_ts = self._events_ts[:n_ready]
+        self._events = self._events[n_ready:]
+        self._events_ts = self._events_ts[n_ready:]
+        # single read spanning the windows of the ready events
+        data, timestamps = stream.get_data_between(
+            events_ts[0] + self._times[0] - 1 / sfreq,
+            events_ts[-1] + self._times[-1] + 1 / sfreq,
+            picks=self._picks,
+        )
+        if timestamps.size < self._times.size:
+            logger.warning(
+                "%i epoch(s) could not be extracted because their samples are not in "
+                "the buffer anymore.",
+                events.size,
+            )
+            return None
+        # closest sample to each event, and first sample of each epoch
+        onsets = np.clip(np.searchsorted(timestamps, events_ts), 1, None)
+        onsets = np.minimum(onsets, timestamps.size - 1)
+        closer = events_ts - timestamps[onsets - 1] < timestamps[onsets] - events_ts
+        starts = onsets - closer + self._first
+        valid = (0 <= starts) & (starts + self._times.size <= timestamps.size)
+        if not valid.all():
+            logger.warning(
+                "%i epoch(s) could not be extracted because their samples are not in "
+                "the buffer anymore.",
+                np.count_nonzero(~valid),
+            )
+            events = events[valid]
+            events_ts = events_ts[valid]
+            starts = starts[valid]
+        # (n_channels, n_epochs, n_times) -> (n_epochs, n_channels, n_times)
+        epochs = data[:, starts[:, np.newaxis] + np.arange(self._times.size)]
+        epochs = epochs.transpose(1, 0, 2)
+        if self._baseline is not None:
+            if not np.issubdtype(epochs.dtype, np.floating):
+                epochs = epochs.astype(np.float64)
+            epochs -= epochs[:, :, self._baseline].mean(axis=-1, keepdims=True)
+        for epoch, event, timestamp in zip(epochs, events, events_ts):
+            self._put((epoch, int(event), float(timestamp)))
+
+    def _put(self, item: Tuple[NDArray[float], int, float]) -> None:
+        """Queue an epoch, dropping the oldest epoch if the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return None
+            except Full:
+                try:
+                    self._queue.get_nowait()
+                    logger.warning(
+                        "The queue of epochs is full, the oldest epoch is dropped. "
+                        "Consider retrieving epochs more often with "
+                        "EpochsStream.get_epoch() or using a larger 'maxsize'."
+                    )
+                except Empty:  # emptied concurrently
+                    pass
+
+    # ----------------------------------------------------------------------------------
+    @property
+    def ch_names(self) -> List[str]:
+        """Name of the channels of the epochs.
+
+        :type: :class:`list` of :class:`str`
+        """
+        return self._ch_names
+
+    @property
+    def connected(self) -> bool:
+        """Status of the extraction of the epochs.
+
+        :type: :class:`bool`
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def n_epochs(self) -> int:
+        """Number of epochs in the queue.
+
+        :type: :class:`int`
+        """
+        return self._queue.qsize()
+
+    @property
+    def times(self) -> NDArray[float]:
+        """Time of the samples of the epochs, relative to the event, in seconds.
+
+        :type: :class:`~numpy.ndarray`
+        """
+        return self._times
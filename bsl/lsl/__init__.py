@@ -1,3 +1,4 @@
+from .async_stream import AsyncStreamInlet, AsyncStreamOutlet  # noqa: F401
 from .functions import (  # noqa: F401
     library_version,
     local_clock,
@@ -0,0 +1,457 @@
+from __future__ import annotations  # c.f. PEP 563, PEP 649
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+from ..utils._checks import check_type
+from ..utils._docs import copy_doc
+from .stream_info import _BaseStreamInfo
+from .stream_inlet import _BUFFER_CHUNK_MAX_BYTES, StreamInlet
+from .stream_outlet import StreamOutlet
+from .utils import _check_timeout
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+    from numpy.typing import DTypeLike, NDArray
+
+# delay in seconds between 2 polls of the inlet while iterating over the chunks
+_POLL_INTERVAL = 0.005
+
+_executor = None
+
+
+def _get_executor() -> Executor:
+    """Retrieve the executor dedicated to the blocking liblsl calls."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(thread_name_prefix="bsl-lsl")
+    return _executor
+
+
+class _AsyncMixin:
+    """Run the blocking calls to liblsl in an executor."""
+
+    def __init__(self, executor: Optional[Executor]):
+        check_type(executor, (Executor, None), "executor")
+        self._executor = executor
+        self._lock = None
+
+    @property
+    def _busy(self) -> bool:
+        """True if an operation is running in the executor."""
+        return self._lock is not None and self._lock.locked()
+
+    async def _run(self, function: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function in the executor, one call at a time.
+
+        The calls to liblsl release the GIL, thus the event loop keeps running while
+        the executor waits on the blocking call.
+        """
+        # the lock is created in the running event loop, c.f. Python 3.9
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        executor = _get_executor() if self._executor is None else self._executor
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            return await loop.run_in_executor(
+                executor, partial(function, *args, **kwargs)
+            )
+
+
+class AsyncStreamInlet(_AsyncMixin):
+    """An awaitable inlet to retrieve data and metadata on the network.
+
+    The blocking operations of the underlying :class:`~bsl.lsl.StreamInlet` are run
+    in an executor, thus they do not block the event loop.
+
+    Parameters
+    ----------
+    sinfo : StreamInfo
+        Description of the stream to connect to.
+    chunk_size : int ``≥ 1`` | ``0``
+        The desired chunk granularity in samples. By default, the ``chunk_size`` defined
+        by the sender (outlet) is used.
+    max_buffered : int ``≥ 0``
+        The maximum amount of data to buffer in the Outlet. The number of samples
+        buffered is ``max_buffered * 100`` if the sampling rate is irregular, else it's
+        ``max_buffered`` seconds.
+    recover : bool
+        Attempt to silently recover lost streams that are recoverable (requires a
+        ``source_id`` to be specified in the :class:`~bsl.lsl.StreamInfo`).
+    processing_flags : sequence of str | ``'all'`` | None
+        Set the post-processing options, as described in
+        :class:`~bsl.lsl.StreamInlet`.
+    max_cache_bytes : int ``≥ 0``
+        Maximum size in bytes of the buffers cached by
+        :meth:`~bsl.lsl.AsyncStreamInlet.pull_chunk`, as described in
+        :class:`~bsl.lsl.StreamInlet`.
+    executor : Executor | None
+        Executor in which the blocking operations are run. By default, a thread pool
+        dedicated to the blocking ``liblsl`` calls and shared by every asynchronous
+        inlet and outlet is used.
+
+    Notes
+    -----
+    Iterating over the inlet with ``async for samples, timestamps in inlet`` yields
+    the chunks as they are received, until the stream is closed with
+    :meth:`~bsl.lsl.AsyncStreamInlet.close_stream`. The inlet is polled without
+    blocking from the event loop, thus an event loop can iterate over many inlets
+    without occupying the threads of the executor.
+
+    The operations on an inlet are run one at a time. The arrays returned are views on
+    the buffers of the inlet, as with :meth:`bsl.lsl.StreamInlet.pull_chunk`.
+    """
+
+    def __init__(
+        self,
+        sinfo: _BaseStreamInfo,
+        chunk_size: int = 0,
+        max_buffered: float = 360,
+        recover: bool = True,
+        processing_flags: Optional[Union[str, Sequence[str]]] = None,
+        *,
+        max_cache_bytes: int = _BUFFER_CHUNK_MAX_BYTES,
+        executor: Optional[Executor] = None,
+    ):
+        super().__init__(executor)
+        self._inlet = StreamInlet(
+            sinfo,
+            chunk_size,
+            max_buffered,
+            recover,
+            processing_flags,
+            max_cache_bytes=max_cache_bytes,
+        )
+        # set by close_stream() to end the iteration over the chunks
+        self._closed = False
+
+    def __aiter__(self):
+        """Iterate over the chunks received by the inlet."""
+        return self
+
+    async def __anext__(self) -> Tuple[Union[List[List[str]], NDArray[float]], NDArray]:
+        """Wait for the next chunk received by the inlet."""
+        while True:
+            if self._closed:
+                raise StopAsyncIteration
+            samples, timestamps = await self.pull_chunk(timeout=0.0)
+            if timestamps.size != 0:
+                return samples, timestamps
+            await asyncio.sleep(_POLL_INTERVAL)
+
+    async def open_stream(self, timeout: Optional[float] = None) -> None:
+        """Subscribe to a data stream.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional timeout (in seconds) of the operation. By default, timeout is
+            disabled.
+
+        See Also
+        --------
+        bsl.lsl.StreamInlet.open_stream
+        """
+        await self._run(self._inlet.open_stream, timeout)
+        self._closed = False
+
+    def close_stream(self) -> None:
+        """Drop the current data stream.
+
+        See Also
+        --------
+        bsl.lsl.StreamInlet.close_stream
+        """
+        self._closed = True
+        self._inlet.close_stream()
+
+    async def time_correction(self, timeout: Optional[float] = None) -> float:
+        """Retrieve an estimated time correction offset for the given stream.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional timeout (in seconds) of the operation. By default, timeout is
+            disabled.
+
+        Returns
+        -------
+        time_correction : float
+            Current estimate of the time correction.
+
+        See Also
+        --------
+        bsl.lsl.StreamInlet.time_correction
+        """
+        return await self._run(self._inlet.time_correction, timeout)
+
+    async def pull_sample(
+        self, timeout: Optional[float] = 0.0
+    ) -> Tuple[Union[List[str], NDArray[float]], Optional[float]]:
+        """Pull a single sample from the inlet.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional timeout (in seconds) of the operation. None correspond to a very
+            large value, effectively disabling the timeout. ``0.`` makes this function
+            non-blocking even if no sample is available.
+
+        Returns
+        -------
+        sample : list of str | array of shape (n_channels,)
+            Sample, as returned by :meth:`bsl.lsl.StreamInlet.pull_sample`.
+        timestamp : float | None
+            Acquisition timestamp on the remote machine.
+        """
+        if _check_timeout(timeout) == 0 and not self._busy:  # run in the event loop
+            return self._inlet.pull_sample(timeout=0.0)
+        return await self._run(self._inlet.pull_sample, timeout)
+
+    async def pull_chunk(
+        self,
+        timeout: Optional[float] = 0.0,
+        max_samples: int = 1024,
+    ) -> Tuple[Union[List[List[str]], NDArray[float]], NDArray[float]]:
+        """Pull a chunk of samples from the inlet.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional timeout (in seconds) of the operation. None correspond to a very
+            large value, effectively disabling the timeout. ``0.`` makes this function
+            non-blocking even if no sample is available.
+        max_samples : int
+            Maximum number of samples to return. The function is waiting until this
+            number of samples is available or until ``timeout`` is reached.
+
+        Returns
+        -------
+        samples : list of list of str | array of shape (n_samples, n_channels)
+            Samples, as returned by :meth:`bsl.lsl.StreamInlet.pull_chunk`.
+        timestamps : array of shape (n_samples,)
+            Acquisition timestamp on the remote machine.
+        """
+        if _check_timeout(timeout) == 0 and not self._busy:  # run in the event loop
+            return self._inlet.pull_chunk(timeout=0.0, max_samples=max_samples)
+        return await self._run(self._inlet.pull_chunk, timeout, max_samples)
+
+    def flush(self) -> int:
+        """Drop all queued and not-yet pulled samples.
+
+        Returns
+        -------
+        n_dropped : int
+            Number of dropped samples.
+        """
+        return self._inlet.flush()
+
+    async def get_sinfo(self, timeout: Optional[float] = None) -> _BaseStreamInfo:
+        """:class:`~bsl.lsl.StreamInfo` corresponding to this Inlet.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional timeout (in seconds) of the operation. By default, timeout is
+            disabled.
+
+        Returns
+        -------
+        sinfo : StreamInfo
+            Description of the stream connected to the inlet.
+        """
+        return await self._run(self._inlet.get_sinfo, timeout)
+
+    # -------------------------------------------------------------------------
+    @copy_doc(_BaseStreamInfo.dtype)
+    @property
+    def dtype(self) -> Union[str, DTypeLike]:
+        return self._inlet.dtype
+
+    @property
+    def inlet(self) -> StreamInlet:
+        """Underlying synchronous inlet.
+
+        :type: :class:`~bsl.lsl.StreamInlet`
+        """
+        return self._inlet
+
+    @copy_doc(_BaseStreamInfo.n_channels)
+    @property
+    def n_channels(self) -> int:
+        return self._inlet.n_channels
+
+    @copy_doc(_BaseStreamInfo.name)
+    @property
+    def name(self) -> str:
+        return self._inlet.name
+
+    @copy_doc(_BaseStreamInfo.sfreq)
+    @property
+    def sfreq(self) -> float:
+        return self._inlet.sfreq
+
+    @copy_doc(_BaseStreamInfo.stype)
+    @property
+    def stype(self) -> str:
+        return self._inlet.stype
+
+    @copy_doc(StreamInlet.samples_available)
+    @property
+    def samples_available(self) -> int:
+        return self._inlet.samples_available
+
+    @copy_doc(StreamInlet.was_clock_reset)
+    @property
+    def was_clock_reset(self) -> bool:
+        return self._inlet.was_clock_reset
+
+
+class AsyncStreamOutlet(_AsyncMixin):
+    """An awaitable outlet to share data and metadata on the network.
+
+    The operations of the underlying :class:`~bsl.lsl.StreamOutlet` are run in an
+    executor, thus they do not block the event loop.
+
+    Parameters
+    ----------
+    sinfo : StreamInfo
+        The :class:`~bsl.lsl.StreamInfo` object describing the stream. Stays constant
+        over the lifetime of the outlet.
+    chunk_size : int ``≥ 1``
+        The desired chunk granularity in samples. By default, each push operation yields
+        one chunk. A :class:`~bsl.lsl.StreamInlet` can override this setting.
+    max_buffered : float ``≥ 0``
+        The maximum amount of data to buffer in the Outlet. The number of samples
+        buffered is ``max_buffered * 100`` if the sampling rate is irregular, else it's
+        ``max_buffered`` seconds.
+    executor : Executor | None
+        Executor in which the operations are run. By default, a thread pool dedicated
+        to the blocking ``liblsl`` calls and shared by every asynchronous inlet and
+        outlet is used.
+
+    Notes
+    -----
+    The operations on an outlet are run one at a time. The samples pushed must not be
+    modified until the push is awaited.
+    """
+
+    def __init__(
+        self,
+        sinfo: _BaseStreamInfo,
+        chunk_size: int = 1,
+        max_buffered: float = 360,
+        *,
+        executor: Optional[Executor] = None,
+    ):
+        super().__init__(executor)
+        self._outlet = StreamOutlet(sinfo, chunk_size, max_buffered)
+
+    async def push_sample(
+        self,
+        x: Union[List[str], NDArray[float]],
+        timestamp: float = 0.0,
+        pushThrough: bool = True,
+    ) -> None:
+        """Push a sample into the outlet.
+
+        Parameters
+        ----------
+        x : list | array of shape (n_channels,)
+            Sample to push, as described in :meth:`bsl.lsl.StreamOutlet.push_sample`.
+        timestamp : float
+            The acquisition timestamp of the sample, in agreement with
+            :func:`bsl.lsl.local_clock`. The default, ``0``, uses the current time.
+        pushThrough : bool
+            If True, push the sample through to the receivers instead of buffering it
+            with subsequent samples.
+        """
+        await self._run(self._outlet.push_sample, x, timestamp, pushThrough)
+
+    async def push_chunk(
+        self,
+        x: Union[List[List[str]], NDArray[float]],
+        timestamp: float = 0.0,
+        pushThrough: bool = True,
+    ) -> None:
+        """Push a chunk of samples into the outlet.
+
+        Parameters
+        ----------
+        x : list of list | array of shape (n_samples, n_channels)
+            Samples to push, as described in :meth:`bsl.lsl.StreamOutlet.push_chunk`.
+        timestamp : float
+            The acquisition timestamp of the last sample, in agreement with
+            :func:`bsl.lsl.local_clock`. The default, ``0``, uses the current time.
+        pushThrough : bool
+            If True, push the samples through to the receivers instead of buffering
+            them with subsequent samples.
+        """
+        await self._run(self._outlet.push_chunk, x, timestamp, pushThrough)
+
+    async def wait_for_consumers(self, timeout: Optional[float]) -> bool:
+        """Wait until at least one :class:`~bsl.lsl.StreamInlet` connects.
+
+        Parameters
+        ----------
+        timeout : float
+            Timeout duration in seconds.
+
+        Returns
+        -------
+        success : bool
+            True if the wait was successful, False if the ``timeout`` expired.
+        """
+        return await self._run(self._outlet.wait_for_consumers, timeout)
+
+    def get_sinfo(self) -> _BaseStreamInfo:
+        """:class:`~bsl.lsl.StreamInfo` corresponding to this Outlet.
+
+        Returns
+        -------
+        sinfo : StreamInfo
+            Description of the stream connected to the outlet.
+        """
+        return self._outlet.get_sinfo()
+
+    # -------------------------------------------------------------------------
+    @copy_doc(_BaseStreamInfo.dtype)
+    @property
+    def dtype(self) -> Union[str, DTypeLike]:
+        return self._outlet.dtype
+
+    @copy_doc(StreamOutlet.has_consumers)
+    @property
+    def has_consumers(self) -> bool:
+        return self._outlet.has_consumers
+
+    @copy_doc(_BaseStreamInfo.n_channels)
+    @property
+    def n_channels(self) -> int:
+        return self._outlet.n_channels
+
+    @copy_doc(_BaseStreamInfo.name)
+    @property
+    def name(self) -> str:
+        return self._outlet.name
+
+    @property
+    def outlet(self) -> StreamOutlet:
+        """Underlying synchronous outlet.
+
+        :type: :class:`~bsl.lsl.StreamOutlet`
+        """
+        return self._outlet
+
+    @copy_doc(_BaseStreamInfo.sfreq)
+    @property
+    def sfreq(self) -> float:
+        return self._outlet.sfreq
+
+    @copy_doc(_BaseStreamInfo.stype)
+    @property
+    def stype(self) -> str:
+        return self._outlet.stype
@@ -2,7 +2,17 @@ from __future__ import annotations  # c.f. PEP 563, PEP 649
 
 import os
 import platform
-from ctypes import CDLL, c_char_p, c_double, c_long, c_void_p, sizeof
+from ctypes import (
+    CDLL,
+    c_char_p,
+    c_double,
+    c_int,
+    c_long,
+    c_size_t,
+    c_uint,
+    c_void_p,
+    sizeof,
+)
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -321,6 +331,36 @@ def _set_types(lib: CDLL) -> CDLL:
     lib.lsl_remove_child.argtypes = [c_void_p, c_void_p]
     lib.lsl_destroy_string.argtypes = [c_void_p]
 
+    # The blocking functions, waiting on the network up to a timeout, are called from
+    # several threads, e.g. the acquisition threads of the Stream objects. A CDLL
+    # releases the GIL during every foreign call, thus a blocking call does not stall
+    # the other Python threads. The prototypes of those functions are declared to
+    # convert the arguments without ambiguity, e.g. a timeout to a double.
+    lib.lsl_resolve_all.argtypes = [c_void_p, c_uint, c_double]
+    lib.lsl_resolve_all.restype = c_int
+    lib.lsl_resolve_byprop.argtypes = [
+        c_void_p,
+        c_uint,
+        c_char_p,
+        c_char_p,
+        c_int,
+        c_double,
+    ]
+    lib.lsl_resolve_byprop.restype = c_int
+    lib.lsl_open_stream.argtypes = [c_void_p, c_double, c_void_p]
+    lib.lsl_time_correction.argtypes = [c_void_p, c_double, c_void_p]
+    lib.lsl_get_fullinfo.argtypes = [c_void_p, c_double, c_void_p]
+    lib.lsl_wait_for_consumers.argtypes = [c_void_p, c_double]
+    lib.lsl_wait_for_consumers.restype = c_int
+    for suffix in ("f", "d", "l", "i", "s", "c", "str", "buf"):
+        getattr(lib, f"lsl_pull_sample_{suffix}").argtypes = [
+            c_void_p,
+            c_void_p,
+            c_int,
+            c_double,
+            c_void_p,
+        ]
+
     # TODO: Check if the minimum version for BSL requires those try/except.
     try:
         lib.lsl_pull_chunk_f.restype = c_long
@@ -331,6 +371,16 @@ def _set_types(lib: CDLL) -> CDLL:
         lib.lsl_pull_chunk_c.restype = c_long
         lib.lsl_pull_chunk_str.restype = c_long
         lib.lsl_pull_chunk_buf.restype = c_long
+        for suffix in ("f", "d", "l", "i", "s", "c", "str", "buf"):
+            getattr(lib, f"lsl_pull_chunk_{suffix}").argtypes = [
+                c_void_p,
+                c_void_p,
+                c_void_p,
+                c_size_t,
+                c_size_t,
+                c_double,
+                c_void_p,
+            ]
     except Exception:
         logger.info(
             "[LIBLSL] Chunk transfer functions not available in your liblsl version."
@@ -1,7 +1,8 @@
 from __future__ import annotations  # c.f. PEP 563, PEP 649
 
 import time
-from ctypes import byref, c_char_p, c_double, c_int, c_size_t, c_void_p
+from collections import OrderedDict
+from ctypes import byref, c_char_p, c_double, c_int, c_size_t, c_void_p, sizeof
 from functools import reduce
 from typing import TYPE_CHECKING
 
@@ -12,13 +13,17 @@ from ..utils._docs import copy_doc
 from .constants import fmt2numpy, fmt2pull_chunk, fmt2pull_sample, post_processing_flags
 from .load_liblsl import lib
 from .stream_info import _BaseStreamInfo
-from .utils import _check_timeout, _free_char_p_array_memory, handle_error
+from .utils import _check_timeout, _decode_char_p_array, handle_error
 
 if TYPE_CHECKING:
+    from ctypes import Array
     from typing import List, Optional, Sequence, Tuple, Union
 
     from numpy.typing import DTypeLike, NDArray
 
+# default maximum size in bytes of the buffers cached by StreamInlet.pull_chunk()
+_BUFFER_CHUNK_MAX_BYTES = 1 << 24
+
 
 class StreamInlet:
     """An inlet to retrieve data and metadata on the network.
@@ -49,6 +54,11 @@ class StreamInlet:
           This option should not be enable if ``'dejitter'`` is not enabled.
         * ``'threadsafe'``: Post-processing is thread-safe, thus the same
           inlet can be read from multiple threads.
+    max_cache_bytes : int ``≥ 0``
+        Maximum size in bytes of the buffers cached by
+        :meth:`~bsl.lsl.StreamInlet.pull_chunk`, by default 16 MiB. The least recently
+        used buffers are evicted above this size, but the buffer of the last pull is
+        always kept.
     """
 
     def __init__(
@@ -58,6 +68,8 @@ class StreamInlet:
         max_buffered: float = 360,
         recover: bool = True,
         processing_flags: Optional[Union[str, Sequence[str]]] = None,
+        *,
+        max_cache_bytes: int = _BUFFER_CHUNK_MAX_BYTES,
     ):
         check_type(sinfo, (_BaseStreamInfo,), "sinfo")
         chunk_size = ensure_int(chunk_size, "chunk_size")
@@ -73,6 +85,12 @@ class StreamInlet:
                 f"{max_buffered} is invalid."
             )
         check_type(recover, (bool,), "recover")
+        max_cache_bytes = ensure_int(max_cache_bytes, "max_cache_bytes")
+        if max_cache_bytes < 0:
+            raise ValueError(
+                "The argument 'max_cache_bytes' must contain a positive integer. "
+                f"{max_cache_bytes} is invalid."
+            )
 
         self._obj = lib.lsl_create_inlet(sinfo._obj, max_buffered, chunk_size, recover)
         self._obj = c_void_p(self._obj)
@@ -117,8 +135,11 @@ class StreamInlet:
         # inlet properties
         self._do_pull_sample = fmt2pull_sample[self._dtype]
         self._do_pull_chunk = fmt2pull_chunk[self._dtype]
-        self._buffer_data = {1: (self._dtype * self._n_channels)()}
-        self._buffer_ts = {}
+        self._buffer_sample = (self._dtype * self._n_channels)()
+        # pull_chunk buffers by size class (power of 2 samples), in LRU order
+        self._buffer_chunk = OrderedDict()
+        self._buffer_chunk_nbytes = 0
+        self._buffer_chunk_max_bytes = max_cache_bytes
 
         # variable to define if the stream is open or not  sinfo_ = inlet.get_sinfo()
         self._stream_is_open = False
@@ -245,7 +266,7 @@ class StreamInlet:
         errcode = c_int()
         timestamp = self._do_pull_sample(
             self._obj,
-            byref(self._buffer_data[1]),
+            byref(self._buffer_sample),
             self._n_channels,
             c_double(timeout),
             byref(errcode),
@@ -256,10 +277,9 @@ class StreamInlet:
 
         if timestamp:
             if self._dtype == c_char_p:
-                sample = [v.decode("utf-8") for v in self._buffer_data[1]]
-                _free_char_p_array_memory(self._buffer_data[1])
+                sample = _decode_char_p_array(self._buffer_sample, self._n_channels)
             else:
-                sample = np.frombuffer(self._buffer_data[1], dtype=self._dtype)
+                sample = np.frombuffer(self._buffer_sample, dtype=self._dtype)
         else:
             sample = [] if self._dtype == c_char_p else np.empty(0, dtype=self._dtype)
             timestamp = None
@@ -315,14 +335,9 @@ class StreamInlet:
                 f"integer. {max_samples} is invalid."
             )
 
-        # look up or create a pre-allocated buffers of appropriate length
+        # look up or create pre-allocated buffers of at least max_samples
         max_samples_data = max_samples * self._n_channels
-        if max_samples_data not in self._buffer_data:
-            self._buffer_data[max_samples_data] = (self._dtype * max_samples_data)()
-        if max_samples not in self._buffer_ts:
-            self._buffer_ts[max_samples] = (c_double * max_samples)()
-        data_buffer = self._buffer_data[max_samples_data]
-        ts_buffer = self._buffer_ts[max_samples]
+        data_buffer, ts_buffer = self._get_buffer_chunk(max_samples)
 
         # read data into it
         errcode = c_int()
@@ -341,14 +356,12 @@ class StreamInlet:
 
         n_samples = int(n_samples_data / self._n_channels)
         if self._dtype == c_char_p:
+            # decoded in bulk and then split per sample, c.f. _decode_char_p_array
+            values = _decode_char_p_array(data_buffer, n_samples_data)
             samples = [
-                [
-                    data_buffer[s * self._n_channels + c].decode("utf-8")
-                    for c in range(self._n_channels)
-                ]
-                for s in range(int(n_samples))
+                values[k : k + self._n_channels]
+                for k in range(0, n_samples_data, self._n_channels)
             ]
-            _free_char_p_array_memory(data_buffer)
         else:
             # this is 400-500x faster than the list approach
             samples = np.frombuffer(data_buffer, dtype=self._dtype)[
@@ -365,6 +378,119 @@ class StreamInlet:
         timestamps = np.frombuffer(ts_buffer, dtype=np.float64)[:n_samples]
         return samples, timestamps
 
+    def pull_chunk_into(
+        self,
+        out: NDArray,
+        timestamps_out: NDArray[float],
+        timeout: Optional[float] = 0.0,
+    ) -> int:
+        """Pull a chunk of samples from the inlet directly into pre-allocated arrays.
+
+        Contrary to :meth:`~bsl.lsl.StreamInlet.pull_chunk`, the samples are written by
+        liblsl in the memory of the provided arrays, without intermediate buffer or
+        copy. For instance, ``out`` can be a view on a segment of a ring buffer.
+
+        Parameters
+        ----------
+        out : array of shape (max_samples, n_channels)
+            C-contiguous and writeable array in which the samples are written. Its
+            data type must match the channel format of the stream. The number of rows
+            defines the maximum number of samples to pull.
+        timestamps_out : array of shape (n_timestamps,)
+            C-contiguous and writeable array of ``float64`` in which the timestamps are
+            written, with ``n_timestamps >= max_samples``.
+        timeout : float | None
+            Optional timeout (in seconds) of the operation. None correspond to a very
+            large value, effectively disabling the timeout. ``0.`` makes this function
+            non-blocking even if no sample is available. The behavior is identical to
+            :meth:`~bsl.lsl.StreamInlet.pull_chunk`.
+
+        Returns
+        -------
+        n_samples : int
+            Number of samples pulled, written in ``out[:n_samples]`` and
+            ``timestamps_out[:n_samples]``. The remaining rows are left untouched.
+
+        Notes
+        -----
+        String streams are not supported.
+        """
+        if self._dtype == c_char_p:
+            raise RuntimeError(
+                "The samples of a string stream can not be pulled into an array. Use "
+                "StreamInlet.pull_chunk() instead."
+            )
+        timeout = _check_timeout(timeout)
+        check_type(out, (np.ndarray,), "out")
+        check_type(timestamps_out, (np.ndarray,), "timestamps_out")
+        if out.ndim != 2 or out.shape[1] != self._n_channels or out.shape[0] == 0:
+            raise ValueError(
+                "The argument 'out' must be an array of shape (max_samples, "
+                f"n_channels) with n_channels={self._n_channels} and max_samples >= 1. "
+                f"{out.shape} is invalid."
+            )
+        if out.dtype != fmt2numpy[self._dtype]:
+            raise ValueError(
+                "The argument 'out' must have the data type of the stream "
+                f"{np.dtype(fmt2numpy[self._dtype]).name}. {out.dtype} is invalid."
+            )
+        if timestamps_out.ndim != 1 or timestamps_out.size < out.shape[0]:
+            raise ValueError(
+                "The argument 'timestamps_out' must be an array of shape "
+                f"(n_timestamps,) with n_timestamps >= {out.shape[0]}. "
+                f"{timestamps_out.shape} is invalid."
+            )
+        if timestamps_out.dtype != np.float64:
+            raise ValueError(
+                "The argument 'timestamps_out' must have the data type float64. "
+                f"{timestamps_out.dtype} is invalid."
+            )
+        for array, name in ((out, "out"), (timestamps_out, "timestamps_out")):
+            if not array.flags["C_CONTIGUOUS"] or not array.flags["WRITEABLE"]:
+                raise ValueError(
+                    f"The argument '{name}' must be a C-contiguous and writeable array."
+                )
+
+        # ctypes views on the memory of the arrays, without copy
+        max_samples = out.shape[0]
+        data_buffer = (self._dtype * out.size).from_buffer(out)
+        ts_buffer = (c_double * max_samples).from_buffer(timestamps_out)
+        errcode = c_int()
+        n_samples_data = self._do_pull_chunk(
+            self._obj,
+            byref(data_buffer),
+            byref(ts_buffer),
+            c_size_t(out.size),
+            c_size_t(max_samples),
+            c_double(timeout),
+            byref(errcode),
+        )
+        handle_error(errcode)
+        if not self._stream_is_open:
+            self._stream_is_open = True
+        return n_samples_data // self._n_channels
+
+    def _get_buffer_chunk(self, max_samples: int) -> Tuple[Array, Array]:
+        """Look up or create the buffers of the size class of max_samples.
+
+        The buffers are allocated for the next power of 2 number of samples and cached
+        in LRU order. The least recently used buffers are evicted once the cache
+        exceeds ``_buffer_chunk_max_bytes``, but the buffers returned are always kept.
+        """
+        size = 1 << (max_samples - 1).bit_length()
+        if size in self._buffer_chunk:
+            self._buffer_chunk.move_to_end(size)
+            return self._buffer_chunk[size]
+        buffers = ((self._dtype * (size * self._n_channels))(), (c_double * size)())
+        self._buffer_chunk[size] = buffers
+        self._buffer_chunk_nbytes += sum(sizeof(buffer) for buffer in buffers)
+        while self._buffer_chunk_max_bytes < self._buffer_chunk_nbytes and 1 < len(
+            self._buffer_chunk
+        ):
+            _, evicted = self._buffer_chunk.popitem(last=False)
+            self._buffer_chunk_nbytes -= sum(sizeof(buffer) for buffer in evicted)
+        return buffers
+
     def flush(self) -> int:
         """Drop all queued and not-yet pulled samples.
 
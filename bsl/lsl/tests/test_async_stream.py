@@ -0,0 +1,135 @@
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from bsl.lsl import AsyncStreamInlet, AsyncStreamOutlet, StreamInfo
+
+
+def test_async_stream():
+    """Test the awaitable inlet and outlet."""
+    x = np.arange(12, dtype=np.float32).reshape(6, 2)
+
+    async def main():
+        sinfo = StreamInfo("test", "", 2, 0.0, "float32", uuid.uuid4().hex[:6])
+        outlet = AsyncStreamOutlet(sinfo, chunk_size=3)
+        inlet = AsyncStreamInlet(sinfo)
+        assert inlet.name == outlet.name == "test"
+        assert inlet.n_channels == outlet.n_channels == 2
+        assert inlet.dtype == outlet.dtype == np.float32
+        await inlet.open_stream(timeout=5)
+        assert await outlet.wait_for_consumers(timeout=5)
+        assert outlet.has_consumers
+        await outlet.push_chunk(x)
+        data, ts = await inlet.pull_chunk(timeout=5, max_samples=6)
+        assert_allclose(data, x)
+        assert ts.size == 6
+        data, ts = await inlet.pull_chunk(timeout=0)
+        assert data.size == ts.size == 0
+        await outlet.push_sample(x[0])
+        sample, ts = await inlet.pull_sample(timeout=5)
+        assert_allclose(sample, x[0])
+        assert isinstance(ts, float)
+        assert isinstance(await inlet.time_correction(timeout=5), float)
+        sinfo = await inlet.get_sinfo(timeout=5)
+        assert sinfo.name == "test"
+        # the event loop is not blocked while waiting for samples
+        ticks = list()
+
+        async def tick():
+            for _ in range(10):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        (data, ts), _ = await asyncio.gather(
+            inlet.pull_chunk(timeout=0.3, max_samples=1), tick()
+        )
+        assert ts.size == 0
+        assert 0.25 < time.perf_counter() - start
+        assert len(ticks) == 10
+        assert ticks[-1] - start < 0.25
+
+    asyncio.run(main())
+
+
+def test_async_stream_iteration():
+    """Test iterating over the chunks received by multiple inlets in one loop."""
+    n_streams = 4
+    x = np.arange(20, dtype=np.float64).reshape(10, 2)
+
+    async def consume(inlet, n_samples):
+        chunks = list()
+        async for data, ts in inlet:
+            assert data.shape[0] == ts.size != 0
+            chunks.append(data.copy())
+            if sum(chunk.shape[0] for chunk in chunks) == n_samples:
+                return np.vstack(chunks)
+
+    async def main():
+        sinfos = [
+            StreamInfo(f"test-{k}", "", 2, 0.0, "float64", uuid.uuid4().hex[:6])
+            for k in range(n_streams)
+        ]
+        executor = ThreadPoolExecutor(max_workers=1)
+        outlets = [AsyncStreamOutlet(sinfo, executor=executor) for sinfo in sinfos]
+        inlets = [AsyncStreamInlet(sinfo) for sinfo in sinfos]
+        await asyncio.gather(*(inlet.open_stream(timeout=5) for inlet in inlets))
+        consumers = [
+            asyncio.ensure_future(consume(inlet, 2 * x.shape[0])) for inlet in inlets
+        ]
+        for k, outlet in enumerate(outlets):
+            await outlet.push_chunk(x + k)
+        await asyncio.sleep(0.1)
+        for k, outlet in enumerate(outlets):
+            await outlet.push_chunk(x - k)
+        results = await asyncio.wait_for(asyncio.gather(*consumers), timeout=5)
+        for k, data in enumerate(results):
+            assert_allclose(data, np.vstack((x + k, x - k)))
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_async_stream_iteration_close():
+    """Test that the iteration over the chunks ends when the stream is closed."""
+    x = np.arange(10, dtype=np.float32).reshape(5, 2)
+
+    async def main():
+        sinfo = StreamInfo("test", "", 2, 0.0, "float32", uuid.uuid4().hex[:6])
+        outlet = AsyncStreamOutlet(sinfo)
+        inlet = AsyncStreamInlet(sinfo)
+        await inlet.open_stream(timeout=5)
+        await outlet.push_chunk(x)
+        n_samples = 0
+        async for data, _ in inlet:
+            n_samples += data.shape[0]
+            if n_samples == x.shape[0]:
+                inlet.close_stream()
+        assert n_samples == x.shape[0]
+
+        # closed while waiting for the next chunk
+        await inlet.open_stream(timeout=5)
+
+        async def consume():
+            return [data.copy() async for data, _ in inlet]
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.1)
+        inlet.close_stream()
+        assert await asyncio.wait_for(consumer, timeout=5) == []
+
+    asyncio.run(main())
+
+
+def test_async_stream_invalid():
+    """Test the validation of the executor."""
+    sinfo = StreamInfo("test", "", 2, 0.0, "float32", uuid.uuid4().hex[:6])
+    with pytest.raises(TypeError, match="must be an instance of"):
+        AsyncStreamInlet(sinfo, executor=1)
+    with pytest.raises(TypeError, match="must be an instance of"):
+        AsyncStreamOutlet(sinfo, executor="executor")
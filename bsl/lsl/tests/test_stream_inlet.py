@@ -1,6 +1,7 @@
 import time
 import uuid
 from itertools import product
+from threading import Thread
 
 import numpy as np
 import pytest
@@ -114,6 +115,103 @@ def test_pull_numerical_chunk(dtype_str, dtype):
         data, ts = inlet.pull_chunk(max_samples=-101)
 
 
+def test_pull_chunk_buffer_cache():
+    """Test the LRU cache of the buffers used by pull_chunk."""
+    x = np.arange(10, dtype=np.float32).reshape(5, 2)
+    sinfo = StreamInfo("test", "", 2, 0.0, "float32", uuid.uuid4().hex[:6])
+    outlet = StreamOutlet(sinfo, chunk_size=5)
+    max_cache_bytes = 32 * 2 * 4 + 32 * 8  # 32 samples
+    inlet = StreamInlet(sinfo, max_cache_bytes=max_cache_bytes)
+    inlet.open_stream(timeout=5)
+    # the buffers are shared by the requests of the same size class
+    for max_samples in (3, 4, 5, 8):
+        inlet.pull_chunk(max_samples=max_samples, timeout=0)
+    assert list(inlet._buffer_chunk) == [4, 8]
+    outlet.push_chunk(x)
+    data, ts = inlet.pull_chunk(max_samples=6, timeout=5)
+    _test_numerical_data(data, x, np.float32, ts, 5)
+    inlet.pull_chunk(max_samples=1, timeout=0)
+    assert list(inlet._buffer_chunk) == [4, 8, 1]
+    # the least recently used buffers are evicted above the maximum size
+    inlet.pull_chunk(max_samples=2, timeout=0)
+    inlet.pull_chunk(max_samples=32, timeout=0)
+    assert list(inlet._buffer_chunk) == [32]
+    assert inlet._buffer_chunk_nbytes == max_cache_bytes
+    # the buffers in use are kept even above the maximum size
+    inlet.pull_chunk(max_samples=1000, timeout=0)
+    assert list(inlet._buffer_chunk) == [1024]
+    # the data returned remains valid after the eviction of its buffer
+    outlet.push_chunk(x)
+    data, ts = inlet.pull_chunk(max_samples=5, timeout=5)
+    inlet.pull_chunk(max_samples=1000, timeout=0)
+    _test_numerical_data(data, x, np.float32, ts, 5)
+    # invalid maximum size
+    with pytest.raises(TypeError, match="must be an integer"):
+        StreamInlet(sinfo, max_cache_bytes=1.5)
+    with pytest.raises(ValueError, match="must contain a positive integer"):
+        StreamInlet(sinfo, max_cache_bytes=-1)
+
+
+def test_pull_chunk_threads():
+    """Test that blocking pulls in parallel threads do not stall the other threads."""
+    n_inlets = 8
+    n_chunks = 50
+    x = np.arange(64 * 32, dtype=np.float32).reshape(64, 32)
+    sinfos = [
+        StreamInfo(f"test-{k}", "", 32, 1000.0, "float32", uuid.uuid4().hex[:6])
+        for k in range(n_inlets)
+    ]
+    outlets = [StreamOutlet(sinfo, chunk_size=64) for sinfo in sinfos]
+    inlets = [StreamInlet(sinfo) for sinfo in sinfos]
+    for inlet in inlets:
+        inlet.open_stream(timeout=5)
+
+    # blocking pulls without samples wait in parallel, and the GIL is released
+    def pull(inlet, results):
+        results.append(inlet.pull_chunk(timeout=0.2, max_samples=1)[1].size)
+
+    results = list()
+    start = time.perf_counter()
+    for inlet in inlets:
+        pull(inlet, results)
+    serialized = time.perf_counter() - start
+    assert 0.2 * n_inlets <= serialized
+    threads = [Thread(target=pull, args=(inlet, results)) for inlet in inlets]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    n_iterations = 0
+    while any(thread.is_alive() for thread in threads):
+        n_iterations += 1  # the main thread keeps running python code
+    parallel = time.perf_counter() - start
+    assert results == [0] * 2 * n_inlets
+    assert parallel < serialized / 4
+    assert 1000 < n_iterations
+
+    # 8 inlets pulling in parallel while the outlets push receive every sample
+    def consume(inlet, received):
+        n_samples = 0
+        while n_samples < n_chunks * x.shape[0]:
+            data, ts = inlet.pull_chunk(timeout=2, max_samples=x.shape[0])
+            if ts.size == 0:
+                break
+            assert_allclose(data, x[(n_samples + np.arange(ts.size)) % x.shape[0]])
+            n_samples += ts.size
+        received.append(n_samples)
+
+    received = list()
+    threads = [Thread(target=consume, args=(inlet, received)) for inlet in inlets]
+    for thread in threads:
+        thread.start()
+    for _ in range(n_chunks):
+        for outlet in outlets:
+            outlet.push_chunk(x)
+        time.sleep(0.001)
+    for thread in threads:
+        thread.join(timeout=10)
+    assert received == [n_chunks * x.shape[0]] * n_inlets
+
+
 def test_pull_str_chunk():
     """Test pull_chunk on a string chunk."""
     x = [["1", "4"], ["2", "5"], ["3", "6"]]
@@ -148,6 +246,86 @@ def test_pull_str_chunk():
     assert data == [x[2]]  # chunk is nested
 
 
+def test_pull_str_chunk_burst():
+    """Test pull_chunk on a burst of string samples, decoded in bulk."""
+    x = [[f"event-{k}", "é€", ""] for k in range(2000)]
+    sinfo = StreamInfo("test", "Markers", 3, 0.0, "string", uuid.uuid4().hex[:6])
+    outlet = StreamOutlet(sinfo, chunk_size=1)
+    inlet = StreamInlet(sinfo)
+    inlet.open_stream(timeout=5)
+    outlet.push_chunk(x)
+    time.sleep(0.5)
+    data, ts = inlet.pull_chunk(max_samples=1500, timeout=1)
+    assert ts.size == 1500
+    assert data == x[:1500]
+    # the cached buffer is reused for the remaining samples
+    data, ts = inlet.pull_chunk(max_samples=1500, timeout=1)
+    assert ts.size == 500
+    assert data == x[1500:]
+    data, ts = inlet.pull_chunk(max_samples=1500, timeout=0)
+    assert data == [] and ts.size == 0
+
+
+@pytest.mark.parametrize(
+    "dtype_str, dtype",
+    [
+        ("float32", np.float32),
+        ("float64", np.float64),
+        ("int8", np.int8),
+        ("int16", np.int16),
+        ("int32", np.int32),
+    ],
+)
+def test_pull_numerical_chunk_into(dtype_str, dtype):
+    """Test pull_chunk_into on a numerical chunk."""
+    x = np.array([[1, 4], [2, 5], [3, 6]], dtype=dtype)
+    sinfo = StreamInfo("test", "", 2, 0.0, dtype_str, uuid.uuid4().hex[:6])
+    outlet = StreamOutlet(sinfo, chunk_size=3)
+    inlet = StreamInlet(sinfo)
+    inlet.open_stream(timeout=5)
+    # pull in a segment of a larger buffer, e.g. a ring buffer
+    buffer = np.zeros((8, 2), dtype=dtype)
+    timestamps = np.zeros(8)
+    outlet.push_chunk(x)
+    n_samples = inlet.pull_chunk_into(buffer[2:7], timestamps[2:7], timeout=5)
+    assert n_samples == 3
+    assert_allclose(buffer[2:5], x)
+    assert_allclose(buffer[:2], 0)
+    assert_allclose(buffer[5:], 0)
+    assert np.all(0 < timestamps[2:5])
+    assert_allclose(timestamps[5:], 0)
+    assert inlet.pull_chunk_into(buffer, timestamps, timeout=0) == 0
+    # request less samples than available
+    outlet.push_chunk(x)
+    time.sleep(0.1)
+    assert inlet.pull_chunk_into(buffer[:2], timestamps, timeout=1) == 2
+    assert_allclose(buffer[:2], x[:2])
+    data, ts = inlet.pull_chunk(max_samples=5, timeout=1)
+    _test_numerical_data(data, x[2:], dtype, ts, 1)
+    # invalid arrays
+    with pytest.raises(ValueError, match="shape"):
+        inlet.pull_chunk_into(np.zeros((3, 3), dtype=dtype), timestamps)
+    with pytest.raises(ValueError, match="data type of the stream"):
+        inlet.pull_chunk_into(buffer.astype(np.complex64), timestamps)
+    with pytest.raises(ValueError, match="n_timestamps >= 8"):
+        inlet.pull_chunk_into(buffer, timestamps[:4])
+    with pytest.raises(ValueError, match="float64"):
+        inlet.pull_chunk_into(buffer, timestamps.astype(np.float32))
+    with pytest.raises(ValueError, match="C-contiguous"):
+        inlet.pull_chunk_into(np.zeros((2, 8), dtype=dtype).T, timestamps)
+    buffer.flags.writeable = False
+    with pytest.raises(ValueError, match="writeable"):
+        inlet.pull_chunk_into(buffer, timestamps)
+
+
+def test_pull_str_chunk_into():
+    """Test that pull_chunk_into does not support string streams."""
+    sinfo = StreamInfo("test", "", 2, 0.0, "string", uuid.uuid4().hex[:6])
+    inlet = StreamInlet(sinfo)
+    with pytest.raises(RuntimeError, match="string stream"):
+        inlet.pull_chunk_into(np.zeros((3, 2)), np.zeros(3))
+
+
 @pytest.mark.xfail(
     reason="liblsl bug with 20.04 and 22.04 LTS, "
     + "https://github.com/sccn/liblsl/issues/179",
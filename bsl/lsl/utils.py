@@ -1,5 +1,5 @@
-from ctypes import POINTER, c_int, c_void_p, cast
-from typing import Optional
+from ctypes import POINTER, c_int, c_void_p, cast, memset, sizeof
+from typing import List, Optional
 
 from .load_liblsl import lib
 
@@ -184,12 +184,29 @@ def handle_error(errcode):
 
 
 # -- Memory function ----------------------------------------------------------
-def _free_char_p_array_memory(char_p_array):
-    num_elements = len(char_p_array)
-    pointers = cast(char_p_array, POINTER(c_void_p))
-    for p in range(num_elements):
-        if pointers[p] is not None:  # only free initialized pointers
-            lib.lsl_destroy_string(pointers[p])
+def _free_char_p_array_memory(char_p_array, num_elements: Optional[int] = None):
+    """Free the strings of the first elements of a char* array and reset them."""
+    if num_elements is None:
+        num_elements = len(char_p_array)
+    # a single slice converts the pointers to int, without per-element indexing
+    pointers = cast(char_p_array, POINTER(c_void_p))[:num_elements]
+    destroy_string = lib.lsl_destroy_string
+    for pointer in pointers:
+        if pointer is not None:  # only free initialized pointers
+            destroy_string(pointer)
+    # reset the pointers to avoid a double free if the array is reused
+    memset(char_p_array, 0, num_elements * sizeof(c_void_p))
+
+
+def _decode_char_p_array(char_p_array, num_elements: int) -> List[str]:
+    """Decode the strings of the first elements of a char* array and free them."""
+    if num_elements == 0:
+        return []
+    # a single slice converts the strings to bytes, and since C strings can not
+    # contain a null character, the strings are joined to be decoded in one pass
+    strings = b"\0".join(char_p_array[:num_elements]).decode("utf-8").split("\0")
+    _free_char_p_array_memory(char_p_array, num_elements)
+    return strings
 
 
 # -- Static checker -----------------------------------------------------------
@@ -0,0 +1,286 @@
+from __future__ import annotations  # c.f. PEP 563, PEP 649
+
+import time
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .stream import Stream
+from .utils._checks import check_type, check_value, ensure_int
+from .utils.logs import logger
+
+if TYPE_CHECKING:
+    from typing import List, Optional, Sequence, Tuple, Union
+
+    from numpy.typing import NDArray
+
+
+class StreamGroup:
+    """Group of streams acquired together and aligned on a common timebase.
+
+    The streams of a group are acquired by a single scheduler thread instead of one
+    acquisition thread per stream, and their data is aligned on the timestamps of
+    a master stream.
+
+    Parameters
+    ----------
+    streams : list of Stream
+        The streams to acquire together. The streams must not be connected.
+    master : int
+        Index of the master stream in ``streams``. The data of the other streams is
+        aligned on the timestamps of the master stream.
+
+    Notes
+    -----
+    The streams are connected, disconnected and acquired by the group, but each
+    stream remains a :class:`~bsl.Stream` on which channel selection, re-referencing
+    or filtering can be applied individually.
+    """
+
+    def __init__(self, streams: Sequence[Stream], master: int = 0):
+        check_type(streams, (list, tuple), "streams")
+        if len(streams) == 0:
+            raise ValueError("The argument 'streams' must contain at least one stream.")
+        for stream in streams:
+            check_type(stream, (Stream,), "stream")
+            if stream.connected:
+                raise RuntimeError(
+                    "The streams of a StreamGroup must be connected by the group. "
+                    f"The stream {stream} is already connected."
+                )
+        if len(set(id(stream) for stream in streams)) != len(streams):
+            raise ValueError("The argument 'streams' contains duplicate streams.")
+        master = ensure_int(master, "master")
+        if not 0 <= master < len(streams):
+            raise ValueError(
+                "The argument 'master' must be the index of the master stream in "
+                f"'streams', between 0 and {len(streams) - 1}. {master} is invalid."
+            )
+        self._streams = list(streams)
+        self._master = master
+        self._acquisition_stop = None
+        self._acquisition_thread = None
+        self._delay_max = None
+
+    def __del__(self):
+        """Disconnect the streams of the group."""
+        try:
+            self.disconnect()
+        except Exception:
+            pass
+
+    def __repr__(self):
+        """Representation of the instance."""
+        status = "ON" if self.connected else "OFF"
+        names = ", ".join(str(stream._name) for stream in self._streams)
+        return f"<StreamGroup: {status} | {names}>"
+
+    def connect(
+        self,
+        processing_flags: Optional[Union[str, Sequence[str]]] = None,
+        timeout: Optional[float] = 2,
+        acquisition_delay: Union[float, Tuple[float, float]] = 0.2,
+    ) -> None:
+        """Connect to the LSL streams and initiate the acquisition.
+
+        Parameters
+        ----------
+        processing_flags : list of str | ``'all'`` | None
+            Set the post-processing options of every stream, as described in
+            :meth:`bsl.Stream.connect`.
+        timeout : float | None
+            Optional timeout (in seconds) of each operation, as described in
+            :meth:`bsl.Stream.connect`.
+        acquisition_delay : float | tuple of shape (2,)
+            Delay in seconds between 2 acquisitions, as described in
+            :meth:`bsl.Stream.connect`. With an adaptive delay, the group is
+            scheduled at the shortest delay among its streams.
+        """
+        if self.connected:
+            logger.warning("The stream group is already connected. Skipping.")
+            return None
+        self._acquisition_stop = Event()
+        self._acquisition_thread = Thread(target=self._acquisition_loop, daemon=True)
+        try:
+            for stream in self._streams:
+                stream._group = self
+                stream.connect(processing_flags, timeout, acquisition_delay)
+        except Exception:
+            self._disconnect_streams()
+            self._acquisition_stop = None
+            self._acquisition_thread = None
+            raise
+        self._delay_max = max(
+            stream._acquisition_delay_bounds[1] for stream in self._streams
+        )
+        self._acquisition_thread.start()
+
+    def disconnect(self) -> None:
+        """Disconnect from the LSL streams and interrupt the acquisition."""
+        if self._acquisition_thread is None:
+            return None
+        self._acquisition_stop.set()
+        if self._acquisition_thread.is_alive():
+            self._acquisition_thread.join()
+        self._disconnect_streams()
+        self._acquisition_stop = None
+        self._acquisition_thread = None
+
+    def get_data(
+        self, winsize: Optional[float] = None, method: str = "linear"
+    ) -> Tuple[NDArray[float], NDArray[float]]:
+        """Retrieve the latest data from the streams, aligned on the master stream.
+
+        Parameters
+        ----------
+        winsize : float | int | None
+            Size of the window of data to view, expressed as in
+            :meth:`bsl.Stream.get_data` for the master stream. If ``None``, the entire
+            buffer of the master stream is returned.
+        method : ``'linear'`` | ``'nearest'``
+            Method used to resample the other streams on the timestamps of the master
+            stream. ``'linear'`` interpolates linearly between the 2 surrounding
+            samples, ``'nearest'`` selects the closest sample.
+
+        Returns
+        -------
+        data : array of shape (n_channels, n_samples)
+            Data of the streams in the given window, concatenated along the channel
+            axis in the order of ``streams``. Samples of a stream outside of the time
+            span covered by its buffer are set to ``NaN``.
+        timestamps : array of shape (n_samples,)
+            Timestamps of the master stream in the given window.
+        """
+        self._check_connected("StreamGroup.get_data()")
+        check_value(method, ("linear", "nearest"), "method")
+        data, timestamps = self._streams[self._master].get_data(winsize)
+        aligned = list()
+        for k, stream in enumerate(self._streams):
+            if k == self._master:
+                aligned.append(data.astype(np.float64, copy=False))
+                continue
+            data_stream, ts_stream = stream.get_data(copy=False)
+            # the beginning of the buffer is zero-filled until it has been written
+            start = np.searchsorted(ts_stream, 0, side="right")
+            aligned.append(
+                _align(data_stream[:, start:], ts_stream[start:], timestamps, method)
+            )
+        return np.vstack(aligned), timestamps
+
+    def _acquisition_loop(self) -> None:
+        """Scheduler thread acquiring every stream of the group until stopped."""
+        stop = self._acquisition_stop
+        next_acquisition = time.perf_counter()
+        while not stop.is_set():
+            delay = self._delay_max
+            for stream in self._streams:
+                # local references since the variables are reset on disconnection
+                condition = stream._acquisition_condition
+                stream_stop = stream._acquisition_stop
+                if condition is None:
+                    continue
+                with condition:
+                    if stream_stop.is_set() or stream._acquisition_paused:
+                        continue
+                    stream._acquire()
+                    if stream._acquisition_delay is not None:
+                        delay = min(delay, stream._acquisition_delay)
+            next_acquisition += delay
+            now = time.perf_counter()
+            if next_acquisition < now:  # late, e.g. after a slow acquisition
+                next_acquisition = now
+            stop.wait(next_acquisition - now)
+
+    def _check_connected(self, name: str):
+        """Check that the group is connected before calling the function 'name'."""
+        if not self.connected:
+            raise RuntimeError(
+                f"The StreamGroup must be connected to use {name}. Please connect to "
+                "the streams with StreamGroup.connect()."
+            )
+
+    def _disconnect_streams(self) -> None:
+        """Disconnect the streams of the group and release them from the group."""
+        for stream in self._streams:
+            if stream.connected:
+                stream.disconnect()
+            stream._group = None
+
+    # ----------------------------------------------------------------------------------
+    @property
+    def ch_names(self) -> List[str]:
+        """Name of the channels, concatenated in the order of the streams.
+
+        :type: :class:`list` of :class:`str`
+        """
+        self._check_connected("the 'ch_names' property")
+        return [ch for stream in self._streams for ch in stream.ch_names]
+
+    @property
+    def connected(self) -> bool:
+        """Connection status of the group.
+
+        :type: :class:`bool`
+        """
+        return self._acquisition_thread is not None and all(
+            stream.connected for stream in self._streams
+        )
+
+    @property
+    def master(self) -> Stream:
+        """Master stream on which the timebase is defined.
+
+        :type: :class:`~bsl.Stream`
+        """
+        return self._streams[self._master]
+
+    @property
+    def streams(self) -> List[Stream]:
+        """Streams of the group.
+
+        :type: :class:`list` of :class:`~bsl.Stream`
+        """
+        return self._streams
+
+
+def _align(
+    data: NDArray, timestamps: NDArray[float], target: NDArray[float], method: str
+) -> NDArray[float]:
+    """Resample data on target timestamps.
+
+    Parameters
+    ----------
+    data : array of shape (n_channels, n_samples)
+        Data to resample.
+    timestamps : array of shape (n_samples,)
+        Sorted timestamps of the data.
+    target : array of shape (n_times,)
+        Timestamps on which the data is resampled.
+    method : ``'linear'`` | ``'nearest'``
+        Resampling method.
+
+    Returns
+    -------
+    out : array of shape (n_channels, n_times)
+        The resampled data, set to ``NaN`` outside of the span of ``timestamps``.
+    """
+    out = np.full((data.shape[0], target.size), np.nan)
+    if timestamps.size == 0:
+        return out
+    valid = (timestamps[0] <= target) & (target <= timestamps[-1])
+    if timestamps.size == 1:
+        out[:, valid] = data[:, :1]
+        return out
+    t = target[valid]
+    # timestamps[idx - 1] <= t < timestamps[idx], except for t = timestamps[-1]
+    idx = np.clip(np.searchsorted(timestamps, t, side="right"), 1, timestamps.size - 1)
+    t0 = timestamps[idx - 1]
+    t1 = timestamps[idx]
+    if method == "nearest":
+        out[:, valid] = data[:, np.where(t - t0 <= t1 - t, idx - 1, idx)]
+        return out
+    dt = t1 - t0
+    weight = np.divide(t - t0, dt, out=np.zeros_like(t), where=dt != 0)
+    out[:, valid] = data[:, idx - 1] * (1 - weight) + data[:, idx] * weight
+    return out
@@ -0,0 +1,357 @@
+from __future__ import annotations  # c.f. PEP 563, PEP 649
+
+import json
+import os
+import time
+from math import ceil
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+import numpy as np
+from mne import create_info
+from mne.utils import check_version
+
+if check_version("mne", "1.6"):
+    from mne._fiff.pick import _picks_to_idx
+else:
+    from mne.io.pick import _picks_to_idx
+
+from .utils._checks import check_type
+from .utils.logs import logger
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Tuple
+
+    from mne import Info
+    from numpy.typing import DTypeLike, NDArray
+
+# Layout of the shared memory block: a header of 8 int64, the metadata of the stream
+# encoded in JSON and padded to a multiple of 8 bytes, the timestamps of shape
+# (n_samples,) and the buffer of shape (n_samples, n_channels).
+_GENERATION = 0
+_N_SAMPLES_STARTED = 1
+_N_SAMPLES_ACQUIRED = 2
+_WRITE_IDX = 3
+_CONNECTED = 4
+_N_SAMPLES = 5
+_N_CHANNELS = 6
+_METADATA_SIZE = 7
+_HEADER_SIZE = 8
+# number of attempts to read a consistent window before giving up
+_MAX_READ_ATTEMPTS = 1000
+# names of the shared memory blocks created by this process
+_CREATED_SHARED_MEMORY = set()
+
+
+def _create_shared_buffer(
+    name: str,
+    n_samples: int,
+    n_channels: int,
+    dtype: DTypeLike,
+    metadata: Dict[str, Any],
+) -> Tuple[SharedMemory, NDArray[np.int64], NDArray[float], NDArray[float]]:
+    """Create a shared memory block holding a ring buffer and its header.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block.
+    n_samples : int
+        Number of samples in the buffer.
+    n_channels : int
+        Number of channels in the buffer.
+    dtype : DTypeLike
+        Data type of the buffer.
+    metadata : dict
+        Metadata of the stream, serializable in JSON.
+
+    Returns
+    -------
+    shm : SharedMemory
+        The shared memory block.
+    header : array of shape (8,)
+        The header of the block.
+    timestamps : array of shape (n_samples,)
+        The timestamps of the buffer, zero-initialized.
+    buffer : array of shape (n_samples, n_channels)
+        The buffer, zero-initialized.
+    """
+    metadata = json.dumps(metadata).encode("utf-8")
+    metadata_size = 8 * ceil(len(metadata) / 8)
+    size = (
+        8 * _HEADER_SIZE
+        + metadata_size
+        + 8 * n_samples
+        + np.dtype(dtype).itemsize * n_samples * n_channels
+    )
+    shm = SharedMemory(name, create=True, size=size)
+    _CREATED_SHARED_MEMORY.add(shm.name)
+    shm.buf[8 * _HEADER_SIZE : 8 * _HEADER_SIZE + len(metadata)] = metadata
+    header = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=shm.buf)
+    header[:] = 0
+    header[_N_SAMPLES] = n_samples
+    header[_N_CHANNELS] = n_channels
+    header[_METADATA_SIZE] = len(metadata)
+    _, timestamps, buffer = _map_shared_buffer(shm, dtype)
+    timestamps[:] = 0
+    buffer[:] = 0
+    return shm, header, timestamps, buffer
+
+
+def _map_shared_buffer(
+    shm: SharedMemory, dtype: DTypeLike
+) -> Tuple[NDArray[np.int64], NDArray[float], NDArray[float]]:
+    """Map the header, the timestamps and the buffer of a shared memory block."""
+    header = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=shm.buf)
+    n_samples = int(header[_N_SAMPLES])
+    n_channels = int(header[_N_CHANNELS])
+    offset = 8 * _HEADER_SIZE + 8 * ceil(int(header[_METADATA_SIZE]) / 8)
+    timestamps = np.ndarray(n_samples, dtype=np.float64, buffer=shm.buf, offset=offset)
+    buffer = np.ndarray(
+        (n_samples, n_channels),
+        dtype=dtype,
+        buffer=shm.buf,
+        offset=offset + timestamps.nbytes,
+    )
+    return header, timestamps, buffer
+
+
+def _n_samples_in_window(
+    timestamps: NDArray[float], write_idx: int, n_samples: int, winsize: float
+) -> int:
+    """Count the samples of a ring buffer acquired in the last winsize seconds.
+
+    The ring buffer is made of 2 sorted segments, ``timestamps[write_idx:]`` holding
+    the oldest samples (or zeros if the buffer was not yet filled) and
+    ``timestamps[:write_idx]`` holding the latest samples. The window is resolved with
+    a binary search in the relevant segment in O(log n_samples).
+
+    Parameters
+    ----------
+    timestamps : array of shape (n_samples,)
+        Timestamps of the ring buffer.
+    write_idx : int
+        Index of the next sample to write, i.e. of the oldest sample.
+    n_samples : int
+        Number of samples written in the ring buffer, at most its size. The slots
+        never written are excluded from the window.
+    winsize : float
+        Duration of the window in seconds. The window includes the samples with a
+        timestamp in ``(t_last - winsize, t_last]``.
+
+    Returns
+    -------
+    n_samples : int
+        Number of samples in the window.
+    """
+    if n_samples == 0:
+        return 0
+    tmin = timestamps[write_idx - 1] - winsize
+    if timestamps[0] <= tmin or write_idx == 0:
+        # the window is contained in the latest segment
+        segment = timestamps[:write_idx] if write_idx != 0 else timestamps
+        n_window = segment.size - np.searchsorted(segment, tmin, side="right")
+    else:
+        segment = timestamps[write_idx:]
+        n_window = (
+            write_idx + segment.size - np.searchsorted(segment, tmin, side="right")
+        )
+    return min(int(n_window), n_samples)
+
+
+def _release_shared_buffer(shm: SharedMemory, unlink: bool) -> None:
+    """Close (and unlink) a shared memory block once its arrays are released."""
+    if unlink:
+        shm.unlink()
+        _CREATED_SHARED_MEMORY.discard(shm.name)
+    try:
+        shm.close()
+    except BufferError:  # views are still alive, the memory is released with them
+        logger.debug("The shared memory %s is released on garbage collection.", shm)
+
+
+class StreamReader:
+    """Read-only access to the buffer of a Stream shared by another process.
+
+    A :class:`~bsl.Stream` connected with the argument ``shared_memory`` publishes
+    its buffer in a shared memory block. A :class:`~bsl.StreamReader` attaches to
+    this block, from any process, and reads the samples acquired by the
+    :class:`~bsl.Stream` without opening a second :class:`~bsl.lsl.StreamInlet`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block, i.e. the argument ``shared_memory`` provided
+        to :meth:`bsl.Stream.connect`.
+
+    Notes
+    -----
+    The reader does not lock the buffer. Every window is validated against the
+    concurrent writes of the acquisition and read again if it was overwritten.
+    """
+
+    def __init__(self, name: str):
+        check_type(name, (str,), "name")
+        self._shm = SharedMemory(name)
+        if os.name == "posix" and self._shm.name not in _CREATED_SHARED_MEMORY:
+            # the block is owned by the process which created it, c.f. bpo-39959
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        size = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=self._shm.buf)[
+            _METADATA_SIZE
+        ]
+        metadata = bytes(self._shm.buf[8 * _HEADER_SIZE : 8 * _HEADER_SIZE + size])
+        self._metadata = json.loads(metadata.decode("utf-8"))
+        self._header, self._timestamps, self._buffer = _map_shared_buffer(
+            self._shm, self._metadata["dtype"]
+        )
+        self._info = create_info(
+            self._metadata["ch_names"], 1, self._metadata["ch_types"]
+        )
+        with self._info._unlock():
+            self._info["sfreq"] = self._metadata["sfreq"]
+            self._info["lowpass"] = self._metadata["sfreq"] / 2
+        self._n_samples_read = int(self._header[_N_SAMPLES_ACQUIRED])
+
+    def __del__(self):
+        """Release the shared memory block."""
+        if getattr(self, "_shm", None) is not None:
+            self.close()
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Context manager exit point."""
+        self.close()
+
+    def __repr__(self):
+        """Representation of the instance."""
+        status = "ON" if self.connected else "OFF"
+        return f"<StreamReader: {status} | {self._metadata['name']}>"
+
+    def close(self) -> None:
+        """Detach from the shared memory block."""
+        if self._shm is None:
+            return None
+        self._header = None
+        self._timestamps = None
+        self._buffer = None
+        _release_shared_buffer(self._shm, unlink=False)
+        self._shm = None
+
+    def get_data(
+        self, winsize: Optional[float] = None, picks=None
+    ) -> Tuple[NDArray[float], NDArray[float]]:
+        """Retrieve the latest data from the shared buffer.
+
+        Parameters
+        ----------
+        winsize : float | int | None
+            Size of the window of data to view in seconds. If the stream sampling
+            rate ``sfreq`` is regular, the window will view the last
+            ``winsize * sfreq`` samples (ceiled) from the buffer. If the stream
+            sampling rate ``sfreq`` is irregular, the window will view the samples
+            acquired in the last ``winsize`` seconds. If ``None``, the entire buffer
+            is returned.
+        picks : str | array-like | slice | None
+            Channels to include, as described in :meth:`bsl.Stream.get_data`.
+
+        Returns
+        -------
+        data : array of shape (n_channels, n_samples)
+            Data in the given window.
+        timestamps : array of shape (n_samples,)
+            Timestamps in the given window.
+        """
+        if self._shm is None:
+            raise RuntimeError("The StreamReader is closed.")
+        size = self._timestamps.size
+        if winsize is None:
+            n_samples = size
+        else:
+            check_type(winsize, ("numeric",), "winsize")
+            if winsize < 0:
+                raise ValueError("The window size must be a positive number.")
+            sfreq = self._info["sfreq"]
+            n_samples = None if sfreq == 0 else min(ceil(winsize * sfreq), size)
+        picks = _picks_to_idx(self._info, picks, "all", exclude=(), allow_empty=False)
+        header = self._header
+        for _ in range(_MAX_READ_ATTEMPTS):
+            generation = header[_GENERATION]
+            if generation % 2 == 1:  # re-configuration in progress
+                time.sleep(0.001)
+                continue
+            n_samples_acquired = int(header[_N_SAMPLES_ACQUIRED])
+            stop = int(header[_WRITE_IDX])
+            if n_samples is None:  # irregular sampling rate
+                n_window = _n_samples_in_window(
+                    self._timestamps, stop, min(n_samples_acquired, size), winsize
+                )
+            else:
+                n_window = n_samples
+            start = stop - n_window
+            if 0 <= start:
+                data = self._buffer[start:stop, picks].T
+                timestamps = self._timestamps[start:stop].copy()
+            else:  # the window wraps around the end of the buffer
+                data = np.vstack(
+                    (self._buffer[start:, picks], self._buffer[:stop, picks])
+                ).T
+                timestamps = np.concatenate(
+                    (self._timestamps[start:], self._timestamps[:stop])
+                )
+            if (
+                generation == header[_GENERATION]
+                and header[_N_SAMPLES_STARTED] - n_samples_acquired <= size - n_window
+            ):
+                self._n_samples_read = n_samples_acquired
+                return data, timestamps
+            time.sleep(0)
+        raise RuntimeError(
+            "A consistent window could not be read from the shared buffer. The "
+            "acquisition is either re-configured or stalled."
+        )
+
+    # ----------------------------------------------------------------------------------
+    @property
+    def ch_names(self) -> List[str]:
+        """Name of the channels.
+
+        :type: :class:`list` of :class:`str`
+        """
+        return self._info.ch_names
+
+    @property
+    def connected(self) -> bool:
+        """Connection status of the shared stream.
+
+        :type: :class:`bool`
+        """
+        return self._shm is not None and bool(self._header[_CONNECTED])
+
+    @property
+    def info(self) -> Info:
+        """Info of the shared stream.
+
+        :type: :class:`~mne.Info`
+        """
+        return self._info
+
+    @property
+    def n_new_samples(self) -> int:
+        """Number of new samples available since the last call to get_data.
+
+        :type: :class:`int`
+        """
+        n_new_samples = int(self._header[_N_SAMPLES_ACQUIRED]) - self._n_samples_read
+        return min(n_new_samples, self._timestamps.size)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared stream.
+
+        :type: :class:`str`
+        """
+        return self._metadata["name"]
@@ -0,0 +1,119 @@
+import time
+import uuid
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from bsl import EpochsStream, Stream
+from bsl.triggers import LSLTrigger
+
+
+@pytest.fixture
+def streams(mock_lsl_stream):
+    """Create a data stream and a marker stream from an LSL trigger."""
+    trigger = LSLTrigger(f"trigger-{uuid.uuid4().hex[:6]}")
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect()
+    marker_stream = Stream(bufsize=10, name=trigger.name)
+    marker_stream.connect(acquisition_delay=0.01)
+    yield trigger, stream, marker_stream
+    marker_stream.disconnect()
+    stream.disconnect()
+    trigger.close()
+
+
+def test_epochs_stream(streams):
+    """Test the online extraction of epochs around events."""
+    trigger, stream, marker_stream = streams
+    epochs = EpochsStream(
+        stream, marker_stream, event_id=[1, 2], tmin=-0.1, tmax=0.2, baseline=None
+    )
+    sfreq = stream.info["sfreq"]
+    assert_allclose(epochs.times, np.arange(-round(0.1 * sfreq), 206) / sfreq)
+    assert epochs.ch_names == stream.ch_names
+    assert not epochs.connected
+    time.sleep(0.2)
+    epochs.connect()
+    assert epochs.connected
+    assert epochs.__repr__().startswith("<EpochsStream: ON | BSL-Player-pytest")
+    for value in (1, 3, 2):  # 3 is not epoched
+        trigger.signal(value)
+        time.sleep(0.05)
+    for value in (1, 2):
+        data, event, timestamp = epochs.get_epoch(timeout=2)
+        assert event == value
+        assert data.shape == (len(stream.ch_names), epochs.times.size)
+        # the epoch matches the samples around the event
+        _, ts = stream.get_data_between(timestamp - 0.2, timestamp + 0.3)
+        onset = np.argmin(np.abs(ts - timestamp))
+        start = onset + int(round(epochs.times[0] * sfreq))
+        ref, _ = stream.get_data_between(ts[start], ts[start + data.shape[1] - 1])
+        assert_allclose(data, ref)
+    assert epochs.get_epoch(timeout=0.3) == (None, None, None)
+    assert epochs.n_epochs == 0
+    epochs.disconnect()
+    assert not epochs.connected
+
+
+def test_epochs_stream_no_prior_marker(streams, caplog):
+    """Test the extraction of all the events when no marker precedes the connection."""
+    trigger, stream, marker_stream = streams
+    assert marker_stream._n_samples_acquired == 0
+    epochs = EpochsStream(stream, marker_stream, tmin=-0.1, tmax=0.1, baseline=None)
+    caplog.set_level(30)  # WARNING
+    caplog.clear()
+    time.sleep(0.2)
+    epochs.connect()
+    time.sleep(0.3)
+    # the slots of the marker buffer never written are not events
+    assert epochs._events.size == 0
+    assert epochs.n_epochs == 0
+    trigger.signal(1)
+    _, event, _ = epochs.get_epoch(timeout=2)
+    assert event == 1
+    assert epochs.get_epoch(timeout=0.3) == (None, None, None)
+    assert "could not be extracted" not in caplog.text
+    epochs.disconnect()
+
+
+def test_epochs_stream_baseline(streams):
+    """Test the baseline correction, the channel selection and the bounded queue."""
+    trigger, stream, marker_stream = streams
+    epochs = EpochsStream(
+        stream, marker_stream, tmin=-0.1, tmax=0.1, picks="eeg", maxsize=2
+    )
+    assert len(epochs.ch_names) == len(stream.get_channel_types(picks="eeg"))
+    time.sleep(0.2)
+    epochs.connect()
+    for value in (1, 2, 3):
+        trigger.signal(value)
+        time.sleep(0.05)
+    time.sleep(0.5)
+    # the oldest epoch is dropped from the full queue
+    assert epochs.n_epochs == 2
+    for value in (2, 3):
+        data, event, _ = epochs.get_epoch(timeout=0)
+        assert event == value
+        assert data.shape == (len(epochs.ch_names), epochs.times.size)
+        assert_allclose(data[:, epochs.times <= 0].mean(axis=1), 0, atol=1e-12)
+    epochs.disconnect()
+
+
+def test_epochs_stream_invalid(streams):
+    """Test the validation of the arguments of the epochs stream."""
+    _, stream, marker_stream = streams
+    with pytest.raises(TypeError, match="must be an instance of"):
+        EpochsStream(stream, None)
+    with pytest.raises(ValueError, match="strictly greater than 'tmin'"):
+        EpochsStream(stream, marker_stream, tmin=0.5, tmax=0.1)
+    with pytest.raises(ValueError, match="do not fit in the buffer"):
+        EpochsStream(stream, marker_stream, tmin=0, tmax=5)
+    with pytest.raises(ValueError, match="interval within the epochs"):
+        EpochsStream(stream, marker_stream, tmin=0, tmax=0.5, baseline=(-1, -0.5))
+    with pytest.raises(ValueError, match="length 2"):
+        EpochsStream(stream, marker_stream, baseline=(None,))
+    with pytest.raises(ValueError, match="strictly positive"):
+        EpochsStream(stream, marker_stream, maxsize=0)
+    with pytest.raises(RuntimeError, match="irregular"):
+        EpochsStream(marker_stream, marker_stream)
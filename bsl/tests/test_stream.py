@@ -1,14 +1,18 @@
+import json
 import time
+import uuid
 from datetime import datetime, timezone
+from math import ceil
 
 import numpy as np
 import pytest
 from matplotlib import pyplot as plt
-from mne import Info, pick_info
+from mne import Info, pick_info, set_bipolar_reference
 from mne.channels import DigMontage
 from mne.io import read_raw
 from mne.utils import check_version
 from numpy.testing import assert_allclose
+from scipy.signal import sosfilt
 
 if check_version("mne", "1.6"):
     from mne._fiff.constants import FIFF
@@ -19,6 +23,8 @@ else:
 
 from bsl import Stream, logger
 from bsl.datasets import testing
+from bsl.lsl import StreamInfo, StreamOutlet, local_clock
+from bsl.stream import _PICKS_CACHE_SIZE
 from bsl.utils._tests import match_stream_and_raw_data
 from bsl.utils.logs import _use_log_level
 
@@ -208,6 +214,44 @@ def test_stream_pick(mock_lsl_stream):
     stream.disconnect()
 
 
+def test_stream_connect_picks(mock_lsl_stream):
+    """Test channel selection at connection."""
+    assert "%(" not in Stream.connect.__doc__  # docstring filled
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect(picks="eeg")
+    raw_ = raw.copy().pick("eeg")
+    assert stream.ch_names == raw_.ch_names
+    # only the selected channels are allocated and copied from the inlet
+    assert stream._buffer.shape[1] == len(raw_.ch_names)
+    assert stream._picks_inlet.size == len(raw_.ch_names)
+    time.sleep(0.1)  # give a bit of time to the stream to acquire the first chunks
+    for _ in range(3):
+        data, _ = stream.get_data(winsize=0.1)
+        match_stream_and_raw_data(data, raw_)
+        time.sleep(0.3)
+    stream.disconnect()
+
+    # explicit channel names are sorted, and the selection is not kept on reconnection
+    stream.connect(picks=["ECG", "Fp1", "vEOG"])
+    raw_ = raw.copy().pick(["Fp1", "vEOG", "ECG"])
+    assert stream.ch_names == raw_.ch_names
+    assert stream._buffer.shape[1] == 3
+    time.sleep(0.1)
+    for _ in range(3):
+        data, _ = stream.get_data(winsize=0.1)
+        match_stream_and_raw_data(data, raw_)
+        time.sleep(0.3)
+    stream.disconnect()
+    stream.connect()
+    assert stream.ch_names == raw.ch_names
+    stream.disconnect()
+
+    # invalid selection
+    with pytest.raises(ValueError, match="could not be interpreted"):
+        stream.connect(picks="non-existing-channel")
+    assert not stream.connected
+
+
 def test_stream_meas_date_and_anonymize(mock_lsl_stream):
     """Test stream measurement date."""
     stream = Stream(bufsize=2, name="BSL-Player-pytest")
@@ -334,6 +378,25 @@ def test_stream_add_reference_channels(mock_lsl_stream):
     stream.disconnect()
 
 
+def test_stream_reference_channels_buffer(mock_lsl_stream):
+    """Test that the reserved reference columns are never written."""
+    stream = Stream(bufsize=0.5, name="BSL-Player-pytest")
+    stream.connect()
+    stream.add_reference_channels(["Ref1", "Ref2"])
+    stream.pick("eeg")  # non-trivial selection of the inlet channels
+    stream.add_reference_channels("Ref3")
+    raw_ = raw.copy().add_reference_channels(["Ref1", "Ref2"])
+    raw_.pick("eeg").add_reference_channels("Ref3")
+    assert stream.ch_names == raw_.ch_names
+    # let the acquisition wrap around the buffer a couple of times
+    time.sleep(1.2)
+    idx = [stream.ch_names.index(ch) for ch in ("Ref1", "Ref2", "Ref3")]
+    assert np.count_nonzero(stream._buffer[:, idx]) == 0
+    data, _ = stream.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw_)
+    stream.disconnect()
+
+
 def test_stream_repr(mock_lsl_stream):
     """Test the stream representation."""
     stream = Stream(bufsize=2)
@@ -390,6 +453,788 @@ def test_stream_n_new_samples(mock_lsl_stream, caplog):
     stream.disconnect()
 
 
+def test_stream_ring_buffer(mock_lsl_stream):
+    """Test that the ring buffer is unwrapped in chronological order."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=0.1)
+    time.sleep(2.2)  # fill the buffer more than twice
+    for _ in range(5):
+        data, ts = stream.get_data(winsize=0.5)
+        assert data.shape == (len(stream.ch_names), ts.size)
+        assert ts.size == ceil(0.5 * stream.info["sfreq"])
+        assert np.all(0 < np.diff(ts))
+        assert_allclose(1 / np.diff(ts), stream.info["sfreq"])
+        match_stream_and_raw_data(data, raw)
+        # windows smaller than the buffer are the end of the full window
+        data2, ts2 = stream.get_data(winsize=0.1)
+        assert ts[-1] <= ts2[-1]
+        time.sleep(0.15)
+    stream.disconnect()
+
+
+def test_stream_get_data_views(mock_lsl_stream):
+    """Test retrieving read-only views and filling a provided array."""
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=0.05)
+    time.sleep(0.5)
+    n_samples = ceil(0.1 * stream.info["sfreq"])
+    for picks in (None, ["Fp1", "Fp2", "F7"], [stream.ch_names[k] for k in (0, 2, 5)]):
+        raw_ = raw.copy().pick(picks) if picks is not None else raw
+        data, ts = stream.get_data(winsize=0.1, picks=picks, copy=False)
+        assert data.shape == (len(raw_.ch_names), n_samples)
+        match_stream_and_raw_data(data, raw_)
+        if np.shares_memory(data, stream._buffer):
+            assert picks != [stream.ch_names[k] for k in (0, 2, 5)]
+            assert not data.flags.writeable
+            assert not ts.flags.writeable
+        out = np.empty((len(raw_.ch_names), n_samples), dtype=stream.dtype)
+        data, ts = stream.get_data(winsize=0.1, picks=picks, out=out)
+        assert data is out
+        assert ts.size == n_samples
+        match_stream_and_raw_data(out, raw_)
+        time.sleep(0.1)
+    # large windows wrap around the end of the ring buffer
+    out = np.empty((len(stream.ch_names), ceil(stream.info["sfreq"])), stream.dtype)
+    for _ in range(3):
+        data, ts = stream.get_data(winsize=1, out=out)
+        assert data is out
+        assert np.all(0 < np.diff(ts))
+        match_stream_and_raw_data(data, raw)
+        time.sleep(0.3)
+    with pytest.raises(ValueError, match="must be an array of shape"):
+        stream.get_data(winsize=0.1, out=out)
+    with pytest.raises(ValueError, match="must have the same dtype"):
+        stream.get_data(winsize=1, out=out.astype(np.float32))
+    stream.disconnect()
+
+
+def test_stream_picks_cache(mock_lsl_stream):
+    """Test the cache of the channel selections resolved in get_data()."""
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect()
+    time.sleep(0.1)
+    assert len(stream._picks_cache) == 0
+    data, _ = stream.get_data(winsize=0.1, picks="eeg")
+    assert len(stream._picks_cache) == 1
+    data2, _ = stream.get_data(winsize=0.1, picks="eeg")
+    assert len(stream._picks_cache) == 1
+    assert data.shape == data2.shape
+    stream.get_data(winsize=0.1, picks=["Fp1", "Fp2"])
+    stream.get_data(winsize=0.1, picks=np.array([0, 1]))
+    assert len(stream._picks_cache) == 3
+    # bads are part of the key
+    stream.info["bads"] = ["Fp1"]
+    data3, _ = stream.get_data(winsize=0.1, picks="eeg")
+    assert data3.shape[0] == data.shape[0] - 1
+    stream.info["bads"] = []
+    # modification of the channels clears the cache
+    stream.set_channel_types({"M1": "emg", "M2": "emg"})
+    assert len(stream._picks_cache) == 0
+    data4, _ = stream.get_data(winsize=0.1, picks="eeg")
+    assert data4.shape[0] == data.shape[0] - 2
+    stream.rename_channels({"Fp1": "Fp1-renamed"})
+    assert len(stream._picks_cache) == 0
+    stream.get_data(winsize=0.1, picks="eeg")
+    stream.drop_channels("Fp2")
+    assert len(stream._picks_cache) == 0
+    stream.get_data(winsize=0.1, picks="eeg")
+    stream.add_reference_channels("CPz")
+    assert len(stream._picks_cache) == 0
+    data5, _ = stream.get_data(winsize=0.1, picks="eeg")
+    assert data5.shape[0] == data4.shape[0]
+    stream.get_data(winsize=0.1, picks=slice(0, 2))  # not cached
+    assert len(stream._picks_cache) == 1
+    # the least recently used selections are evicted
+    for k in range(2 * _PICKS_CACHE_SIZE):
+        stream.get_data(winsize=0.1, picks=[k % len(stream.ch_names)])
+        stream.get_data(winsize=0.1, picks="eeg")
+    assert len(stream._picks_cache) == _PICKS_CACHE_SIZE
+    assert ("eeg", ()) in stream._picks_cache
+    stream.disconnect()
+    assert len(stream._picks_cache) == 0
+
+
+def test_stream_acquisition_thread(mock_lsl_stream):
+    """Test that a single acquisition thread survives interruptions."""
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=0.005)
+    thread = stream._acquisition_thread
+    assert thread.is_alive()
+    time.sleep(0.2)
+    match_stream_and_raw_data(stream.get_data(winsize=0.1)[0], raw)
+    stream.drop_channels("TRIGGER")
+    stream.add_reference_channels("CPz")
+    assert stream._acquisition_thread is thread
+    assert thread.is_alive()
+    assert not stream._acquisition_paused
+    raw_ = raw.copy().drop_channels("TRIGGER").add_reference_channels("CPz")
+    time.sleep(0.1)
+    match_stream_and_raw_data(stream.get_data(winsize=0.1)[0], raw_)
+    # acquisition is paused within the context manager
+    with stream._interrupt_acquisition():
+        n_new_samples = stream.n_new_samples
+        time.sleep(0.1)
+        assert stream.n_new_samples == n_new_samples
+    time.sleep(0.1)
+    assert n_new_samples < stream.n_new_samples
+    stream.disconnect()
+    assert not thread.is_alive()
+
+
+def test_stream_wait_for_samples(mock_lsl_stream):
+    """Test blocking until new samples are acquired."""
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=0.01)
+    stream.get_data()
+    assert stream.wait_for_samples(16, timeout=1)
+    assert 16 <= stream.n_new_samples
+    data, ts = stream.get_data(winsize=0.1)
+    match_stream_and_raw_data(data, raw)
+    # timeout
+    start = time.perf_counter()
+    assert not stream.wait_for_samples(stream._timestamps.size, timeout=0.2)
+    assert 0.2 <= time.perf_counter() - start < 1
+    with pytest.raises(ValueError, match="must be a strictly positive integer"):
+        stream.wait_for_samples(0)
+    with pytest.raises(ValueError, match="must be a strictly positive integer"):
+        stream.wait_for_samples(stream._timestamps.size + 1)
+    with pytest.raises(TypeError, match="must be an integer"):
+        stream.wait_for_samples(1.5)
+    stream.disconnect()
+    with pytest.raises(RuntimeError, match="connect to the stream"):
+        stream.wait_for_samples(1)
+
+
+def test_stream_iter_chunks(mock_lsl_stream):
+    """Test iterating over windows as new samples are acquired."""
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=0.01)
+    time.sleep(0.2)
+    n_samples = ceil(0.1 * stream.info["sfreq"])
+    last = None
+    for k, (data, ts) in enumerate(
+        stream.iter_chunks(winsize=0.1, step=0.05, picks="eeg", timeout=1)
+    ):
+        assert data.shape == (len(_picks_to_idx(stream.info, "eeg")), n_samples)
+        assert ts.size == n_samples
+        if last is not None:
+            # a step of 50 ms is acquired between 2 windows, within a chunk
+            assert 0.05 - 16 / stream.info["sfreq"] <= ts[-1] - last[-1]
+        last = ts
+        if k == 4:
+            break
+    # the iteration stops on disconnection
+    iterator = stream.iter_chunks(winsize=0.1)
+    next(iterator)
+    stream.disconnect()
+    with pytest.raises(StopIteration):
+        next(iterator)
+
+
+def test_stream_consistent_reads(mock_lsl_stream):
+    """Test that concurrent reads of the full buffer are never torn."""
+    stream = Stream(bufsize=0.2, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=0.002)
+    time.sleep(0.5)
+    for _ in range(20):
+        data, ts = stream.get_data()
+        assert np.all(0 < np.diff(ts))
+        match_stream_and_raw_data(data, raw)
+        data, ts = stream.get_data(picks=["Fp1", "Fp2"])
+        assert np.all(0 < np.diff(ts))
+        match_stream_and_raw_data(data, raw.copy().pick(["Fp1", "Fp2"]))
+
+    # simulate a write overlapping the window during the read
+    calls = list()
+    _read = stream._read
+
+    def _read_and_write(*args):
+        data, ts = _read(*args)
+        if len(calls) == 0:
+            stream._n_samples_started += 16
+            stream._n_samples_acquired += 16
+        calls.append(ts)
+        return data, ts
+
+    stream._read = _read_and_write
+    stream.get_data(winsize=0.1)
+    assert len(calls) == 1  # the write did not reach the window
+    calls.clear()
+    stream.get_data()
+    assert 2 <= len(calls)  # the write reached the window, the read is retried
+    stream.disconnect()
+
+
+def test_stream_adaptive_acquisition_delay(mock_lsl_stream):
+    """Test the adaptive acquisition delay."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=(0.005, 0.5))
+    assert stream._acquisition_delay_bounds == (0.005, 0.5)
+    time.sleep(2)
+    # the player pushes a chunk of 16 samples every 16 ms, thus the first pulls
+    # retrieve half of the buffer and the delay is reduced
+    assert 0.005 <= stream._acquisition_delay < 0.5
+    data, ts = stream.get_data(winsize=0.1)
+    assert_allclose(1 / np.diff(ts), stream.info["sfreq"])
+    match_stream_and_raw_data(data, raw)
+    stream.disconnect()
+    # a fixed delay is not adapted
+    stream.connect(acquisition_delay=0.05)
+    time.sleep(0.5)
+    assert stream._acquisition_delay == 0.05
+    stream.disconnect()
+    # invalid bounds
+    with pytest.raises(ValueError, match="must be provided as a tuple"):
+        stream.connect(acquisition_delay=(0.1, 0.2, 0.3))
+    with pytest.raises(ValueError, match="delay_min <= delay_max"):
+        stream.connect(acquisition_delay=(0.2, 0.1))
+    with pytest.raises(ValueError, match="must be a strictly positive number"):
+        stream.connect(acquisition_delay=(0, 0.1))
+    with pytest.raises(TypeError, match="must be an instance of"):
+        stream.connect(acquisition_delay="0.1")
+
+
+def test_stream_overflow_warning(mock_lsl_stream, caplog):
+    """Test the warning logged before the buffer overflows."""
+    stream = Stream(bufsize=0.4, name="BSL-Player-pytest")
+    with _use_log_level("INFO"):
+        caplog.set_level(20)  # INFO
+        stream.connect(acquisition_delay=0.01)
+        time.sleep(0.1)  # let the acquisition drain the first chunks
+        stream.get_data()
+        caplog.clear()
+        time.sleep(0.8)
+        assert "buffer is about to overflow" in caplog.text
+        assert "new samples exceeds the buffer size" in caplog.text
+        idx = caplog.text.index("buffer is about to overflow")
+        assert idx < caplog.text.rindex("new samples exceeds the buffer size")
+    stream.disconnect()
+
+
+def test_stream_filter(mock_lsl_stream):
+    """Test the causal filters applied during the acquisition."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect()
+    time.sleep(0.2)
+    stream.filter(1, 40, picks="ECG")
+    assert stream.info["highpass"] == 0  # not all data channels are filtered
+    assert stream.info["lowpass"] == stream.info["sfreq"] / 2
+    stream.filter(1, 40, picks="eeg")
+    assert stream.info["highpass"] == 1
+    assert stream.info["lowpass"] == 40
+    stream.filter(52, 48, picks="data", iir_params=dict(order=2, ftype="butter"))
+    assert stream.info["highpass"] == 1  # band-stop
+    assert stream.info["lowpass"] == 40
+    assert len(stream._filters) == 3
+    data, _ = stream.get_data(winsize=0.2)
+    assert data.shape[0] == len(stream.ch_names)
+    assert np.isfinite(data).all()
+
+    # applying the filters chunk by chunk is equivalent to a one-shot filter, even
+    # when the chunks wrap around the end of the buffer
+    rng = np.random.default_rng(0)
+    n_inlet = stream._inlet.n_channels
+    chunks = [rng.standard_normal((n, n_inlet)) for n in (100, 700, 16, 350, 1)]
+    picks = [filt["picks"].copy() for filt in stream._filters]
+    zi = [filt["zi"].copy() for filt in stream._filters]
+    sos = [filt["sos"] for filt in stream._filters]
+    with stream._interrupt_acquisition():
+        for chunk in chunks:
+            stream._write(chunk, np.arange(chunk.shape[0], dtype=np.float64))
+        data, _ = stream._read(1024, None, True, None)
+    expected = np.vstack(chunks).astype(stream.dtype).astype(np.float64)
+    for k in range(3):
+        expected[:, picks[k]], _ = sosfilt(
+            sos[k], expected[:, picks[k]], axis=0, zi=zi[k]
+        )
+    assert_allclose(data.T, expected[-1024:], rtol=1e-4, atol=1e-4)
+
+    # channel selection remaps the filters
+    stream.drop_channels(["vEOG", "ECG", "hEOG"])
+    assert len(stream._filters) == 2  # the filter on 'ECG' is removed
+    stream.pick(stream.ch_names[:2][::-1])
+    assert all(filt["picks"].size == 2 for filt in stream._filters)
+    assert all(filt["zi"].shape[-1] == 2 for filt in stream._filters)
+    data, _ = stream.get_data(winsize=0.2)
+    assert data.shape[0] == 2
+    stream.disconnect()
+    assert len(stream._filters) == 0
+
+    # invalid filters
+    stream.connect()
+    with pytest.raises(TypeError, match="must be an instance of"):
+        stream.filter(1, 40, iir_params="butter")
+    with pytest.raises(ValueError, match="picks"):
+        stream.filter(1, 40, picks="meg")
+    stream.disconnect()
+
+
+def test_stream_set_eeg_reference(mock_lsl_stream):
+    """Test the re-referencing applied during the acquisition."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect()
+    time.sleep(0.2)
+    stream.add_reference_channels("CPz")
+    stream.set_eeg_reference("average")
+    assert stream.info["custom_ref_applied"] == FIFF.FIFFV_MNE_CUSTOM_REF_ON
+    raw_ = raw.copy().add_reference_channels("CPz")
+    raw_.set_eeg_reference("average", verbose=False)
+    # the samples acquired before the re-referencing are re-referenced as well
+    data, _ = stream.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw_)
+    for _ in range(3):
+        time.sleep(0.3)
+        data, _ = stream.get_data(winsize=0.1)
+        match_stream_and_raw_data(data, raw_)
+    # re-reference on top of the average reference
+    stream.set_eeg_reference("Cz")
+    raw_.set_eeg_reference(["Cz"], verbose=False)
+    data, _ = stream.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw_)
+    assert_allclose(data[stream.ch_names.index("Cz")], 0)
+    # the channel selection keeps the inlet channels used by the reference
+    stream.pick(["Fp1", "Fp2"])
+    raw_.pick(["Fp1", "Fp2"])
+    assert sorted(np.array(raw.ch_names)[stream._picks_inlet]) == ["Cz", "Fp1", "Fp2"]
+    stream.add_reference_channels("Ref1")
+    raw_.add_reference_channels("Ref1")
+    time.sleep(0.3)
+    data, _ = stream.get_data(winsize=0.1)
+    match_stream_and_raw_data(data, raw_)
+    stream.disconnect()
+    assert stream._derivation is None
+
+    # invalid references
+    stream.connect()
+    with pytest.raises(ValueError, match="is not part of the stream"):
+        stream.set_eeg_reference("101")
+    with pytest.raises(TypeError, match="must be an instance of"):
+        stream.set_eeg_reference(101)
+    stream.info["bads"] = [ch for ch in stream.ch_names if ch not in ("vEOG", "ECG")]
+    with pytest.raises(ValueError, match="all channels of type eeg are marked as bad"):
+        stream.set_eeg_reference("average")
+    stream.set_eeg_reference([])  # no-op
+    assert stream._derivation is None
+    assert stream.info["custom_ref_applied"] == FIFF.FIFFV_MNE_CUSTOM_REF_ON
+    stream.disconnect()
+
+
+def test_stream_set_eeg_reference_filter(mock_lsl_stream):
+    """Test the re-referencing of the filtered channels."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect()
+    time.sleep(0.2)
+    stream.filter(1, 40, picks="eeg")
+    eeg = _picks_to_idx(stream.info, "eeg")
+    # the acquisition thread is blocked while the test holds the condition, thus the
+    # buffer contains only the chunks written below
+    rng = np.random.default_rng(0)
+    n_inlet = stream._inlet.n_channels
+    chunks = [rng.standard_normal((n, n_inlet)) for n in (600, 424)]
+    with stream._acquisition_condition:
+        picks = stream._filters[0]["picks"].copy()
+        zi = stream._filters[0]["zi"].copy()
+        sos = stream._filters[0]["sos"]
+        stream._write(chunks[0], np.arange(chunks[0].shape[0], dtype=np.float64))
+        stream.set_eeg_reference("average")
+        stream._write(chunks[1], np.arange(chunks[1].shape[0], dtype=np.float64))
+        data, _ = stream._read(1024, None, True, None)
+    # filtering then re-referencing is equivalent to re-referencing then filtering,
+    # without transient when the filter state is re-referenced
+    expected = np.vstack(chunks).astype(stream.dtype).astype(np.float64)
+    expected[:, picks], _ = sosfilt(sos, expected[:, picks], axis=0, zi=zi)
+    expected[:, eeg] -= expected[:, eeg].mean(axis=1, keepdims=True)
+    assert_allclose(data.T, expected, rtol=1e-4, atol=1e-4)
+    stream.disconnect()
+
+    # filters applied to a subset of the channels involved in the reference
+    stream.connect()
+    stream.filter(1, 40, picks=["Fp1", "Fp2"])
+    with pytest.raises(RuntimeError, match="only a subset of the channels"):
+        stream.set_eeg_reference("average")
+    assert stream.info["custom_ref_applied"] == FIFF.FIFFV_MNE_CUSTOM_REF_OFF
+    assert stream._derivation is None
+    stream.disconnect()
+    stream.connect()
+    stream.filter(1, 40, picks="ECG")  # not involved in the reference
+    stream.set_eeg_reference("average")
+    assert stream.info["custom_ref_applied"] == FIFF.FIFFV_MNE_CUSTOM_REF_ON
+    stream.disconnect()
+
+
+def test_stream_set_bipolar_reference(mock_lsl_stream):
+    """Test the bipolar derivations applied during the acquisition."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect()
+    time.sleep(0.2)
+    stream.set_bipolar_reference(["Fp1", "F7"], ["Fp2", "F8"], ch_name=["FP", "F"])
+    raw_ = set_bipolar_reference(
+        raw, ["Fp1", "F7"], ["Fp2", "F8"], ch_name=["FP", "F"], verbose=False
+    )
+    assert stream.ch_names == raw_.ch_names
+    assert stream.info["custom_ref_applied"] == FIFF.FIFFV_MNE_CUSTOM_REF_ON
+    # the samples acquired before the derivation are derived as well
+    data, _ = stream.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw_)
+    for _ in range(3):
+        time.sleep(0.3)
+        data, _ = stream.get_data(winsize=0.1)
+        match_stream_and_raw_data(data, raw_)
+    # the dropped anodes and cathodes are still pulled from the inlet
+    assert all(raw.ch_names.index(ch) in stream._picks_inlet for ch in ("Fp1", "Fp2"))
+    stream.pick("FP")
+    assert stream._picks_inlet.size == 2
+    stream.disconnect()
+
+    # the filters applied to the anode and to the cathode apply to the derivation
+    stream.connect()
+    time.sleep(0.2)
+    stream.filter(1, 40, picks=["Fp1", "Fp2", "F7"])
+    stream.set_bipolar_reference(["Fp1", "F7"], ["Fp2", "Fp1"], drop_refs=False)
+    assert stream.ch_names[-2:] == ["Fp1-Fp2", "F7-Fp1"]
+    assert stream._filters[0]["picks"].size == 5
+    for _ in range(3):
+        time.sleep(0.3)
+        data, _ = stream.get_data(winsize=0.5, picks=["Fp1", "Fp2", "F7", "Fp1-Fp2"])
+        assert_allclose(data[3], data[0] - data[1], rtol=1e-6, atol=1e-12)
+        data, _ = stream.get_data(winsize=0.5, picks=["Fp1", "F7", "F7-Fp1"])
+        assert_allclose(data[2], data[1] - data[0], rtol=1e-6, atol=1e-12)
+
+    # invalid derivations
+    with pytest.raises(ValueError, match="number of anodes and of cathodes"):
+        stream.set_bipolar_reference(["Fp1", "F7"], "Fp2")
+    with pytest.raises(ValueError, match="is not part of the stream"):
+        stream.set_bipolar_reference("101", "Fp2")
+    with pytest.raises(ValueError, match="is already part of the stream"):
+        stream.set_bipolar_reference("Fp1", "Fp2", drop_refs=False)
+    with pytest.raises(ValueError, match="number of channel names"):
+        stream.set_bipolar_reference("Fp1", "F8", ch_name=["a", "b"])
+    with pytest.raises(TypeError, match="must be an instance of"):
+        stream.set_bipolar_reference("Fp1", "F8", drop_refs=1)
+    stream.disconnect()
+
+
+def test_stream_record(mock_lsl_stream, tmp_path):
+    """Test recording the stream to disk."""
+    stream = Stream(bufsize=0.1, name="BSL-Player-pytest")
+    stream.connect(acquisition_delay=0.2)  # pull chunks larger than the buffer
+    with pytest.raises(RuntimeError, match="The stream is not recorded"):
+        stream.stop_recording()
+    stream.record(tmp_path / "test.bin")
+    with pytest.raises(RuntimeError, match="The stream is already recorded"):
+        stream.record(tmp_path / "test2.bin")
+    with pytest.raises(RuntimeError, match="while the stream is recorded"):
+        stream.pick("eeg")
+    with pytest.raises(RuntimeError, match="while the stream is recorded"):
+        stream.add_reference_channels("CPz")
+    with pytest.raises(RuntimeError, match="while the stream is recorded"):
+        stream.rename_channels({"Fp1": "101"})
+    with pytest.raises(RuntimeError, match="while the stream is recorded"):
+        stream.set_channel_types({"Fp1": "eog"})
+    time.sleep(2)
+    stream.stop_recording()
+    with open(tmp_path / "test.json") as file:
+        sidecar = json.load(file)
+    assert sidecar["ch_names"] == stream.ch_names
+    assert sidecar["ch_types"] == stream.get_channel_types()
+    assert sidecar["sfreq"] == stream.info["sfreq"]
+    dtype = [
+        ("timestamp", np.float64),
+        ("data", sidecar["dtype"], (sidecar["n_channels"],)),
+    ]
+    records = np.fromfile(tmp_path / "test.bin", dtype=dtype)
+    # no sample is dropped although the buffer wrapped around many times
+    assert 1.5 * stream.info["sfreq"] < records.size
+    assert_allclose(1 / np.diff(records["timestamp"]), stream.info["sfreq"])
+    match_stream_and_raw_data(records["data"].T, raw)
+    stream.pick("eeg")
+
+    # overwrite and stop on disconnect
+    with pytest.raises(FileExistsError, match="already exists"):
+        stream.record(tmp_path / "test.bin")
+    with pytest.raises(ValueError, match="reserved for the sidecar"):
+        stream.record(tmp_path / "test.json", overwrite=True)
+    assert (tmp_path / "test.json").read_text().startswith("{")
+    stream.record(tmp_path / "test.bin", overwrite=True)
+    time.sleep(0.5)
+    stream.disconnect()
+    with open(tmp_path / "test.json") as file:
+        sidecar = json.load(file)
+    assert sidecar["ch_names"] == raw.copy().pick("eeg").ch_names
+    dtype[1] = ("data", sidecar["dtype"], (sidecar["n_channels"],))
+    records = np.fromfile(tmp_path / "test.bin", dtype=dtype)
+    assert records.size != 0
+    match_stream_and_raw_data(records["data"].T, raw.copy().pick("eeg"))
+
+
+def test_stream_config(mock_lsl_stream, tmp_path):
+    """Test saving and loading a stream configuration."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect()
+    stream.drop_channels(["M1", "M2", "TRIGGER"])
+    stream.set_channel_types({"hEOG": "misc"})
+    stream.set_channel_units({"Fp1": "microvolts"})
+    stream.set_montage("standard_1020", on_missing="ignore")
+    stream.info["bads"] = ["Fp2"]
+    stream.add_reference_channels("CPz")
+    stream.set_eeg_reference("average")
+    stream.filter(1, 40, picks="eeg")
+    stream.rename_channels({"ECG": "heart"})
+    fname = tmp_path / "config.json"
+    stream.save_stream_config(fname)
+    with pytest.raises(FileExistsError, match="already exists"):
+        stream.save_stream_config(fname)
+    stream.save_stream_config(fname, overwrite=True)
+
+    # the configuration is applied at connection, in a single allocation
+    stream2 = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream2.load_stream_config(fname)
+    stream2.connect()
+    assert stream2.ch_names == stream.ch_names
+    assert stream2.get_channel_types() == stream.get_channel_types()
+    assert stream2.get_channel_units() == stream.get_channel_units()
+    assert stream2.info["bads"] == ["Fp2"]
+    assert stream2.info["highpass"] == 1
+    assert stream2.info["lowpass"] == 40
+    assert stream2.info["custom_ref_applied"] == stream.info["custom_ref_applied"]
+    assert stream2._buffer.shape[1] == len(stream.ch_names)
+    assert_allclose(stream2._picks_inlet, stream._picks_inlet)
+    assert_allclose(stream2._derivation.toarray(), stream._derivation.toarray())
+    for filt, filt2 in zip(stream._filters, stream2._filters, strict=True):
+        assert_allclose(filt["sos"], filt2["sos"])
+        assert_allclose(filt["picks"], filt2["picks"])
+    pos = stream.get_montage().get_positions()
+    pos2 = stream2.get_montage().get_positions()
+    assert pos["ch_pos"].keys() == pos2["ch_pos"].keys()
+    for ch, loc in pos["ch_pos"].items():
+        assert_allclose(loc, pos2["ch_pos"][ch])
+    # the channels not filtered are identical
+    time.sleep(0.5)
+    _, ts = stream2.get_data(winsize=0.2)
+    time.sleep(0.3)  # both streams acquired the window
+    picks = ["vEOG", "hEOG", "heart"]
+    data, _ = stream.get_data_between(ts[0], ts[-1], picks=picks)
+    data2, _ = stream2.get_data_between(ts[0], ts[-1], picks=picks)
+    assert_allclose(data, data2)
+    stream2.disconnect()
+    # the configuration is applied again at the next connection
+    stream2.connect()
+    assert stream2.ch_names == stream.ch_names
+    stream2.disconnect()
+
+    # the configuration is applied to a connected stream
+    stream3 = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream3.connect()
+    time.sleep(0.2)
+    with stream3._acquisition_condition:  # blocks the acquisition thread
+        stream3.load_stream_config(fname)
+        assert stream3._n_samples_acquired == stream3._n_samples_started == 0
+    assert stream3.ch_names == stream.ch_names
+    assert stream3._buffer.shape == stream._buffer.shape
+    time.sleep(0.5)
+    _, ts = stream3.get_data(winsize=0.2)
+    time.sleep(0.3)  # both streams acquired the window
+    data3, _ = stream3.get_data_between(ts[0], ts[-1], picks=picks)
+    data, _ = stream.get_data_between(ts[0], ts[-1], picks=picks)
+    assert_allclose(data, data3)
+    stream3.disconnect()
+    stream.disconnect()
+
+    # invalid configurations
+    with open(fname) as file:
+        config = json.load(file)
+    config["inlet"]["n_channels"] += 1
+    with open(fname, "w") as file:
+        json.dump(config, file)
+    stream4 = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream4.load_stream_config(fname)
+    with pytest.raises(ValueError, match="does not match the LSL stream"):
+        stream4.connect()
+    assert not stream4.connected
+    assert stream4._inlet is None and stream4._info is None
+    del config["filters"]
+    with open(fname, "w") as file:
+        json.dump(config, file)
+    with pytest.raises(ValueError, match="is missing"):
+        stream4.load_stream_config(fname)
+
+
+def test_stream_memmap(mock_lsl_stream, tmp_path):
+    """Test the memory-mapped buffer."""
+    fname = tmp_path / "buffer.dat"
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect(memmap=fname)
+    assert isinstance(stream._buffer, np.memmap)
+    assert isinstance(stream._timestamps, np.memmap)
+    time.sleep(0.5)
+    data, _ = stream.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw)
+    # the buffer can be mapped read-only by another consumer
+    n_samples = stream._timestamps.size
+    n_channels = len(stream.ch_names)
+    with stream._interrupt_acquisition():
+        timestamps = np.memmap(fname, dtype=np.float64, mode="r", shape=n_samples)
+        buffer = np.memmap(
+            fname,
+            dtype=stream.dtype,
+            mode="r",
+            offset=timestamps.nbytes,
+            shape=(n_samples, n_channels),
+        )
+        assert_allclose(timestamps, stream._timestamps)
+        assert_allclose(buffer, stream._buffer)
+    # modifications of the channels replace the file
+    stream.add_reference_channels("CPz")
+    stream.pick("eeg")
+    stream.set_eeg_reference("average")
+    raw_ = raw.copy().add_reference_channels("CPz").pick("eeg")
+    raw_.set_eeg_reference("average", verbose=False)
+    assert isinstance(stream._buffer, np.memmap)
+    n_channels = len(stream.ch_names)
+    assert fname.stat().st_size == n_samples * (8 + n_channels * stream.dtype.itemsize)
+    time.sleep(0.3)
+    data, _ = stream.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw_)
+    stream.disconnect()
+    assert fname.exists()
+    with pytest.raises(TypeError, match="provided path"):
+        stream.connect(memmap=101)
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        stream.connect(memmap=tmp_path / "missing" / "buffer.dat")
+    assert not stream.connected
+    # a buffer which can not be mapped closes the inlet
+    with pytest.raises(OSError):
+        stream.connect(memmap=tmp_path)
+    assert not stream.connected
+    assert stream._inlet is None
+
+
+def test_stream_memmap_windows(mock_lsl_stream, tmp_path, monkeypatch):
+    """Test the memory-mapped buffer which can not be replaced on Windows."""
+    monkeypatch.setattr("bsl.stream.sys.platform", "win32")
+    fname = tmp_path / "buffer.dat"
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    stream.connect(memmap=fname)
+    assert isinstance(stream._buffer, np.memmap)
+    assert stream._buffer.filename == fname.resolve()
+    assert not fname.with_name(fname.name + ".tmp").exists()
+    time.sleep(0.3)
+    data, _ = stream.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw)
+    with pytest.raises(RuntimeError, match="memory-mapped stream on Windows"):
+        stream.add_reference_channels("CPz")
+    with pytest.raises(RuntimeError, match="memory-mapped stream on Windows"):
+        stream.pick("eeg")
+    assert stream.ch_names == raw.ch_names
+    stream.set_eeg_reference("average")  # in-place
+    stream.disconnect()
+
+
+def test_stream_get_data_between(mock_lsl_stream):
+    """Test the retrieval of the data acquired between 2 timestamps."""
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect()
+    # the slots of the ring buffer not yet written are excluded
+    stream2 = Stream(bufsize=10, name="BSL-Player-pytest")
+    stream2.connect()
+    time.sleep(0.3)
+    with stream2._acquisition_condition:  # blocks the acquisition thread
+        n_samples = stream2._n_samples_acquired
+        assert 0 < n_samples < stream2._timestamps.size
+        data, ts = stream2.get_data_between(-np.inf, np.inf)
+        assert ts.size == data.shape[1] == n_samples
+        assert (0 < ts).all()
+        _, ts = stream2.get_data_between(-1, ts[0])
+        assert ts.size == 1
+    stream2.disconnect()
+    time.sleep(1.0)  # the ring buffer wraps around
+    data_ref, ts_ref = stream.get_data()
+    # the latest half of the buffer is not overwritten between the 2 reads
+    n = ts_ref.size
+    for start, stop in ((n // 2, n - 1), (n - 100, n - 50), (n - 10, n - 10)):
+        data, ts = stream.get_data_between(ts_ref[start], ts_ref[stop])
+        assert_allclose(ts, ts_ref[start : stop + 1])
+        assert_allclose(data, data_ref[:, start : stop + 1])
+    data, ts = stream.get_data_between(ts_ref[-20], ts_ref[-10], picks="eeg")
+    picks = _picks_to_idx(stream.info, "eeg")
+    assert_allclose(data, data_ref[picks, -20:-9])
+    n_new_samples = stream.n_new_samples
+    stream.get_data_between(ts_ref[-20], ts_ref[-10], copy=False)
+    assert n_new_samples <= stream.n_new_samples  # not reset
+    _, ts = stream.get_data_between(-np.inf, np.inf)
+    assert ts.size == stream._timestamps.size
+    with pytest.raises(ValueError, match="greater than or equal"):
+        stream.get_data_between(ts_ref[20], ts_ref[10])
+    with pytest.raises(TypeError, match="must be an instance of"):
+        stream.get_data_between("1", ts_ref[10])
+    stream.disconnect()
+    with pytest.raises(RuntimeError, match="connect to the stream"):
+        stream.get_data_between(0, 1)
+
+
+def test_stream_irregular():
+    """Test the time-based buffer of a stream with an irregular sampling rate."""
+    name = f"test-irregular-{uuid.uuid4().hex[:6]}"
+    outlet = StreamOutlet(StreamInfo(name, "Markers", 1, 0.0, "float32", "pytest"))
+    stream = Stream(bufsize=2, name=name)
+    stream.connect(acquisition_delay=0.01)
+    assert stream._timestamps.size == 1024
+    # the slots of the ring buffer not yet written are excluded from the window
+    data, ts = stream.get_data(winsize=1)
+    assert data.shape == (1, 0)
+    assert ts.size == 0
+    # the buffer grows, thus more samples than its current size can be awaited
+    assert not stream.wait_for_samples(2000, timeout=0)
+
+    def push(timestamps):
+        offset = stream._n_samples_acquired
+        for k, timestamp in enumerate(timestamps):
+            outlet.push_sample(np.array([offset + k], dtype=np.float32), timestamp)
+        start = time.perf_counter()
+        while stream._n_samples_acquired < offset + timestamps.size:
+            assert time.perf_counter() - start < 10
+            time.sleep(0.01)
+
+    # 3000 samples in 0.3 seconds do not fit in the initial buffer, which grows
+    t0 = local_clock()
+    timestamps = t0 + np.arange(3000) * 1e-4
+    push(timestamps)
+    assert stream._timestamps.size == 4096
+    data, ts = stream.get_data(winsize=0.1)
+    n_samples = np.count_nonzero(timestamps[-1] - 0.1 < timestamps)
+    assert_allclose(ts, timestamps[-n_samples:])
+    assert_allclose(data[0], np.arange(3000 - n_samples, 3000))
+    data, ts = stream.get_data()
+    assert ts.size == 4096
+    assert_allclose(ts[-3000:], timestamps)
+
+    # sparse samples fit in the buffer, which wraps around
+    timestamps2 = timestamps[-1] + 0.01 * np.arange(1, 2001)
+    push(timestamps2)
+    assert stream._timestamps.size == 4096
+    for winsize in (0.5, 1, 10):
+        all_ts = np.concatenate((timestamps, timestamps2))
+        n_samples = np.count_nonzero(all_ts[-1] - winsize < all_ts)
+        data, ts = stream.get_data(winsize=winsize)
+        assert_allclose(ts, all_ts[-n_samples:])
+        assert_allclose(data[0], np.arange(5000 - n_samples, 5000))
+
+    # time-range queries, within a segment or across the end of the ring buffer
+    for tmin, tmax in ((2500, 2600), (1500, 2500), (2000, 4990), (4000, 4000)):
+        data, ts = stream.get_data_between(all_ts[tmin], all_ts[tmax])
+        assert_allclose(ts, all_ts[tmin : tmax + 1])
+        assert_allclose(data[0], np.arange(tmin, tmax + 1))
+    data, ts = stream.get_data_between(all_ts[4990] + 1e-6, all_ts[4991] - 1e-6)
+    assert data.shape == (1, 0)
+    assert ts.size == 0
+    # the part of the range not in the buffer is not returned
+    data, ts = stream.get_data_between(all_ts[0], all_ts[-1] + 10)
+    assert_allclose(ts, all_ts[5000 - 4096 :])
+    data, ts = stream.get_data_between(all_ts[-1] + 1, all_ts[-1] + 10)
+    assert ts.size == 0
+    stream.disconnect()
+
+
 def test_stream_invalid_interrupt():
     """Test invalid acquisition interruption."""
     stream = Stream(bufsize=0.4, name="BSL-Player-pytest")
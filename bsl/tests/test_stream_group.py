@@ -0,0 +1,98 @@
+import time
+
+import numpy as np
+import pytest
+from mne.io import read_raw
+from numpy.testing import assert_allclose
+
+from bsl import Stream, StreamGroup
+from bsl.datasets import testing
+from bsl.stream_group import _align
+from bsl.utils._tests import match_stream_and_raw_data
+
+fname = testing.data_path() / "sample-eeg-ant-raw.fif"
+raw = read_raw(fname, preload=True)
+
+
+def test_stream_group(mock_lsl_stream):
+    """Test the aligned acquisition of a group of streams."""
+    streams = [Stream(bufsize=2, name="BSL-Player-pytest") for _ in range(3)]
+    group = StreamGroup(streams, master=1)
+    assert not group.connected
+    group.connect()
+    assert group.connected
+    assert group.master is streams[1]
+    # a single thread acquires every stream of the group
+    assert group._acquisition_thread.is_alive()
+    for stream in streams:
+        assert stream._acquisition_thread is group._acquisition_thread
+    streams[0].pick("eeg")
+    streams[2].set_eeg_reference("average")
+    assert group.ch_names == [ch for stream in streams for ch in stream.ch_names]
+    time.sleep(0.3)
+
+    for method in ("linear", "nearest"):
+        data, timestamps = group.get_data(winsize=0.1, method=method)
+        assert data.shape == (len(group.ch_names), timestamps.size)
+        assert_allclose(1 / np.diff(timestamps), streams[1].info["sfreq"])
+        n_eeg = len(streams[0].ch_names)
+        n_all = len(streams[1].ch_names)
+        # the streams share the same source thus the same timestamps
+        match_stream_and_raw_data(data[:n_eeg], raw.copy().pick("eeg"))
+        match_stream_and_raw_data(data[n_eeg : n_eeg + n_all], raw)
+        raw_ = raw.copy().set_eeg_reference("average", verbose=False)
+        match_stream_and_raw_data(data[n_eeg + n_all :], raw_)
+
+    # the group is disconnected with its streams
+    group.disconnect()
+    assert not group.connected
+    assert all(not stream.connected for stream in streams)
+    assert all(stream._group is None for stream in streams)
+    with pytest.raises(RuntimeError, match="must be connected"):
+        group.get_data()
+    # a stream released by the group acquires on its own
+    streams[0].connect()
+    assert streams[0]._acquisition_thread is not None
+    time.sleep(0.2)
+    assert 0 < streams[0].n_new_samples
+    streams[0].disconnect()
+
+
+def test_stream_group_invalid(mock_lsl_stream):
+    """Test the validation of the arguments of a stream group."""
+    stream = Stream(bufsize=2, name="BSL-Player-pytest")
+    with pytest.raises(TypeError, match="must be an instance of"):
+        StreamGroup(stream)
+    with pytest.raises(ValueError, match="at least one"):
+        StreamGroup([])
+    with pytest.raises(ValueError, match="duplicate"):
+        StreamGroup([stream, stream])
+    with pytest.raises(ValueError, match="index of the master"):
+        StreamGroup([stream], master=1)
+    stream.connect()
+    with pytest.raises(RuntimeError, match="already connected"):
+        StreamGroup([stream])
+    stream.disconnect()
+    # failure to connect a stream disconnects the others
+    group = StreamGroup([stream, Stream(bufsize=2, name="non-existing-stream")])
+    with pytest.raises(RuntimeError, match="do not uniquely identify"):
+        group.connect()
+    assert not group.connected
+    assert not stream.connected
+    assert stream._group is None
+
+
+def test_align():
+    """Test the resampling of data on target timestamps."""
+    timestamps = np.array([1.0, 2.0, 3.0, 5.0])
+    data = np.array([[0.0, 10.0, 20.0, 40.0], [1.0, 1.0, 1.0, 1.0]])
+    target = np.array([0.5, 1.0, 1.25, 2.5, 4.5, 5.0, 5.5])
+    out = _align(data, timestamps, target, "linear")
+    assert_allclose(out[0], [np.nan, 0.0, 2.5, 15.0, 35.0, 40.0, np.nan])
+    assert_allclose(out[1], [np.nan, 1.0, 1.0, 1.0, 1.0, 1.0, np.nan])
+    out = _align(data, timestamps, target, "nearest")
+    assert_allclose(out[0], [np.nan, 0.0, 0.0, 10.0, 40.0, 40.0, np.nan])
+    out = _align(data[:, :1], timestamps[:1], target, "linear")
+    assert_allclose(out[0], [np.nan, 0.0] + [np.nan] * 5)
+    out = _align(data[:, :0], timestamps[:0], target, "linear")
+    assert np.isnan(out).all()
@@ -0,0 +1,134 @@
+import multiprocessing as mp
+import time
+import uuid
+from math import ceil
+
+import numpy as np
+import pytest
+from mne.io import read_raw
+from numpy.testing import assert_allclose
+
+from bsl import Stream, StreamReader
+from bsl.datasets import testing
+from bsl.lsl import StreamInfo, StreamOutlet, local_clock
+from bsl.utils._tests import match_stream_and_raw_data
+
+fname = testing.data_path() / "sample-eeg-ant-raw.fif"
+raw = read_raw(fname, preload=True)
+
+
+def _read_in_process(name, queue):
+    """Read the shared buffer from a different process."""
+    with StreamReader(name) as reader:
+        time.sleep(0.3)
+        queue.put((reader.ch_names, *reader.get_data(winsize=0.2)))
+
+
+def test_stream_reader(mock_lsl_stream):
+    """Test reading a shared stream."""
+    name = f"bsl-{uuid.uuid4().hex[:8]}"
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect(shared_memory=name)
+    reader = StreamReader(name)
+    assert reader.connected
+    assert reader.ch_names == stream.ch_names
+    assert reader.info["sfreq"] == stream.info["sfreq"]
+    assert reader.name == "BSL-Player-pytest"
+    assert reader.__repr__() == "<StreamReader: ON | BSL-Player-pytest>"
+    time.sleep(0.3)
+    assert 0 < reader.n_new_samples
+    with stream._acquisition_condition:  # blocks the acquisition thread
+        data, timestamps = reader.get_data(winsize=0.2)
+        assert reader.n_new_samples == 0
+    assert data.shape == (len(stream.ch_names), ceil(0.2 * stream.info["sfreq"]))
+    assert_allclose(1 / np.diff(timestamps), stream.info["sfreq"])
+    match_stream_and_raw_data(data, raw)
+    data, _ = reader.get_data(winsize=0.1, picks="eeg")
+    match_stream_and_raw_data(data, raw.copy().pick("eeg"))
+    data, _ = reader.get_data()
+    assert data.shape == (len(stream.ch_names), stream._timestamps.size)
+
+    # in-place processing is published to the readers
+    stream.set_eeg_reference("average")
+    raw_ = raw.copy().set_eeg_reference("average", verbose=False)
+    data, _ = reader.get_data(winsize=0.2)
+    match_stream_and_raw_data(data, raw_)
+
+    # the channels of a shared stream can not be modified
+    with pytest.raises(RuntimeError, match="shared with other processes"):
+        stream.pick("eeg")
+    with pytest.raises(RuntimeError, match="shared with other processes"):
+        stream.add_reference_channels("CPz")
+    with pytest.raises(RuntimeError, match="shared with other processes"):
+        stream.rename_channels({"Fp1": "101"})
+    with pytest.raises(ValueError, match="not both"):
+        Stream(bufsize=1).connect(memmap="test.dat", shared_memory="test")
+    # the inlet of a stream which can not create its shared buffer is closed
+    stream2 = Stream(bufsize=1, name="BSL-Player-pytest")
+    with pytest.raises(FileExistsError):
+        stream2.connect(shared_memory=name)
+    assert not stream2.connected
+    assert stream2._inlet is None and stream2._shm is None
+    assert reader.connected  # the existing shared buffer is not released
+    stream2.connect()
+    stream2.disconnect()
+
+    stream.disconnect()
+    assert not reader.connected
+    reader.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        reader.get_data()
+    with pytest.raises(FileNotFoundError):
+        StreamReader(name)
+
+
+def test_stream_reader_process(mock_lsl_stream):
+    """Test reading a shared stream from a different process."""
+    name = f"bsl-{uuid.uuid4().hex[:8]}"
+    stream = Stream(bufsize=1, name="BSL-Player-pytest")
+    stream.connect(shared_memory=name)
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_read_in_process, args=(name, queue))
+    process.start()
+    ch_names, data, timestamps = queue.get(timeout=30)
+    process.join(timeout=10)
+    assert process.exitcode == 0
+    assert ch_names == stream.ch_names
+    assert_allclose(1 / np.diff(timestamps), stream.info["sfreq"])
+    match_stream_and_raw_data(data, raw)
+    stream.disconnect()
+
+
+def test_stream_reader_irregular():
+    """Test reading a time window from a shared stream with an irregular rate."""
+    name = f"test-irregular-{uuid.uuid4().hex[:6]}"
+    outlet = StreamOutlet(StreamInfo(name, "Markers", 1, 0.0, "float32", "pytest"))
+    stream = Stream(bufsize=2, name=name)
+    stream.connect(acquisition_delay=0.01, shared_memory=f"bsl-{uuid.uuid4().hex[:8]}")
+    # the slots of the ring buffer not yet written are excluded from the window
+    with StreamReader(stream._shm.name) as reader:
+        data, ts = reader.get_data(winsize=1)
+        assert data.shape == (1, 0)
+        assert ts.size == 0
+    # the shared buffer does not grow
+    with pytest.raises(ValueError, match="smaller than the buffer size"):
+        stream.wait_for_samples(2000)
+    timestamps = local_clock() + np.arange(1500) * 1e-3
+    for k, timestamp in enumerate(timestamps):
+        outlet.push_sample(np.array([k], dtype=np.float32), timestamp)
+    start = time.perf_counter()
+    while stream._n_samples_acquired < timestamps.size:
+        assert time.perf_counter() - start < 10
+        time.sleep(0.01)
+    # the shared buffer does not grow and wraps around
+    assert stream._timestamps.size == 1024
+    with StreamReader(stream._shm.name) as reader:
+        for winsize in (0.1, 0.5, 10):
+            n_samples = min(
+                np.count_nonzero(timestamps[-1] - winsize < timestamps), 1024
+            )
+            data, ts = reader.get_data(winsize=winsize)
+            assert_allclose(ts, timestamps[-n_samples:])
+            assert_allclose(data[0], np.arange(1500 - n_samples, 1500))
+    stream.disconnect()
@@ -15,7 +15,9 @@ docdict: Dict[str, str] = dict()
 # -------- Documentation to inc. from MNE -------
 keys: Tuple[str, ...] = (
     "anonymize_info_notes",
+    "baseline_epochs",
     "daysback_anonymize_info",
+    "iir_params",
     "keep_his_anonymize_info",
     "match_alias",
     "match_case",
@@ -23,6 +25,7 @@ keys: Tuple[str, ...] = (
     "montage_types",
     "on_missing_montage",
     "picks_all",
+    "picks_all_data",
     "ref_channels",
 )
 
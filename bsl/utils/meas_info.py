@@ -108,6 +108,7 @@ def create_info(
         info = mne_create_info(ch_names, 1, ch_types)
         with info._unlock():
             info["sfreq"] = sfreq
+            info["lowpass"] = sfreq / 2
             for ch, ch_unit in zip(info["chs"], ch_units):
                 ch["unit_mul"] = ch_unit
         # add manufacturer information if available
@@ -129,6 +130,7 @@ def create_info(
         info["device_info"] = dict()
         with info._unlock():
             info["sfreq"] = sfreq
+            info["lowpass"] = sfreq / 2
         info["device_info"] = dict()
 
     info._check_consistency()